@@ -1,20 +1,45 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+import asyncio
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session, select
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.cache import InMemoryLRUCache
 from app.config import settings
-from app.models import User
-from app.database import get_session
+from app.models import Principal, User
+from app.database import async_engine, get_async_session
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. `bcrypt__rounds` pins the work factor, so hashes
+# made with any other cost are flagged for rehashing on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+# Decoded JWT payloads, each kept until its token expires
+token_cache = InMemoryLRUCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_PRINCIPAL_TTL_SECONDS
+)
+# Minimal user principals (no password hash), so authenticated requests skip
+# the user lookup. Entries expire after AUTH_PRINCIPAL_TTL_SECONDS, which
+# bounds staleness across workers; call `invalidate_principal` on changes.
+principal_cache = InMemoryLRUCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_PRINCIPAL_TTL_SECONDS
+)
 
 
 def hash_password(password: str) -> str:
@@ -44,6 +69,112 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool with admission control.
+    
+    bcrypt releases the GIL, so a few threads hash in parallel while the event
+    loop keeps serving other requests. At most `max_pending` operations may be
+    queued or running; beyond that, callers get 429 instead of piling up.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    def _release(self, _future: Any) -> None:
+        self.pending -= 1
+        self.completed += 1
+    
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a hashing function on the pool.
+        
+        Raises:
+            HTTPException: 429 if too many operations are already pending
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password-hash"
+            )
+        
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(func, *args)
+        self.pending += 1
+        # Released when the hash finishes, even if the request was cancelled
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(self._release, f))
+        return await asyncio.wrap_future(future)
+    
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the password hashing pool.
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password
+        
+    Raises:
+        HTTPException: 429 if the hashing pool is saturated
+    """
+    return await password_hasher.run(pwd_context.hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the password hashing pool.
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Stored hash
+        
+    Returns:
+        (matches, new_hash) where new_hash is set when the stored hash used a
+        different work factor and should be replaced
+        
+    Raises:
+        HTTPException: 429 if the hashing pool is saturated
+    """
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -74,6 +205,130 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_user_token(user: User) -> str:
+    """
+    Create an access token for a user.
+    
+    Besides the subject, the token carries the claims needed to authenticate
+    without a database lookup (stateless principal mode).
+    
+    Args:
+        user: User the token is issued to
+        
+    Returns:
+        Encoded JWT token
+    """
+    return create_access_token(
+        data={
+            "sub": str(user.id),
+            "username": user.username,
+            "gen": user.token_generation or 0,
+        },
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+
+# `scope` claim of tokens that only open task event streams
+STREAM_TOKEN_SCOPE = "task_events"
+
+
+def create_stream_token(user: Union[User, Principal]) -> str:
+    """
+    Create a short-lived token for `GET /tasks/events`.
+    
+    Browsers' EventSource cannot send headers, so the token travels in the
+    query string, where it ends up in access and proxy logs. It is scoped to
+    the event stream and expires after TASK_EVENTS_TOKEN_EXPIRE_SECONDS, and
+    access tokens are never accepted there.
+    
+    Args:
+        user: Authenticated user the stream is opened for
+        
+    Returns:
+        Encoded JWT token
+    """
+    return create_access_token(
+        data={
+            "sub": str(user.id),
+            "username": user.username,
+            "gen": user.token_generation or 0,
+            "scope": STREAM_TOKEN_SCOPE,
+        },
+        expires_delta=timedelta(seconds=settings.TASK_EVENTS_TOKEN_EXPIRE_SECONDS)
+    )
+
+
+class RevocationList:
+    """
+    Per-user minimum token generation, for users who revoked their tokens.
+    
+    Only users who ever revoked appear here, so the map stays small. It is
+    reloaded from the users table every AUTH_REVOCATION_REFRESH_SECONDS and
+    updated immediately in the worker that handles a revocation.
+    """
+    
+    def __init__(self):
+        self._min_generation: Dict[int, int] = {}
+        self.refreshed_at: Optional[datetime] = None
+    
+    def is_revoked(self, user_id: int, generation: int) -> bool:
+        return generation < self._min_generation.get(user_id, 0)
+    
+    def revoke(self, user_id: int, generation: int) -> None:
+        """Reject this user's tokens older than `generation`."""
+        self._min_generation[user_id] = max(generation, self._min_generation.get(user_id, 0))
+    
+    async def refresh(self, session: AsyncSession) -> None:
+        statement = select(User.id, User.token_generation).where(User.token_generation > 0)
+        self._min_generation = dict((await session.exec(statement)).all())
+        self.refreshed_at = datetime.utcnow()
+    
+    def stats(self) -> Dict[str, object]:
+        return {
+            "users": len(self._min_generation),
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
+
+
+revocations = RevocationList()
+
+
+async def run_revocation_refresh() -> None:
+    """Background loop reloading the revocation list until cancelled."""
+    while True:
+        try:
+            async with AsyncSession(async_engine) as session:
+                await revocations.refresh(session)
+        except Exception as e:
+            print(f"Revocation list refresh failed: {e}")
+        await asyncio.sleep(settings.AUTH_REVOCATION_REFRESH_SECONDS)
+
+
+async def revoke_user_tokens(session: AsyncSession, user_id: int) -> int:
+    """
+    Invalidate every token issued to a user so far.
+    
+    Args:
+        session: Database session
+        user_id: User whose tokens are revoked
+        
+    Returns:
+        The user's new token generation
+    """
+    statement = (
+        update(User)
+        .where(User.id == user_id)
+        .values(token_generation=User.token_generation + 1)
+        .returning(User.token_generation)
+    )
+    generation = (await session.exec(statement)).scalar_one()
+    await session.commit()
+    
+    revocations.revoke(user_id, generation)
+    invalidate_principal(user_id)
+    return generation
+
+
 def verify_token(token: str) -> dict:
     """
     Verify and decode a JWT token.
@@ -93,36 +348,66 @@ def verify_token(token: str) -> dict:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    if settings.AUTH_CACHE_ENABLED:
+        payload = token_cache.get_nowait(token)
+        if payload is not None:
+            return payload
+    
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
     except JWTError:
         raise credentials_exception
+    
+    expires_in = payload.get("exp", 0) - time.time()
+    if settings.AUTH_CACHE_ENABLED and expires_in > 0:
+        token_cache.set_nowait(token, payload, ttl=expires_in)
+    return payload
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
-) -> User:
+def principal_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop a user's cached principal after the user record changes."""
+    principal_cache.delete_nowait(principal_key(user_id))
+
+
+async def get_user_from_token(
+    token: str,
+    session: AsyncSession,
+    scope: Optional[str] = None
+) -> Union[User, Principal]:
     """
-    Get the current authenticated user from JWT token.
+    Resolve a JWT access token to its user.
+    
+    With AUTH_STATELESS_PRINCIPAL enabled, a `Principal` built from the token
+    claims is returned without touching the database; otherwise the user is
+    loaded (through the principal cache).
     
     Args:
-        credentials: HTTP Bearer credentials
+        token: JWT access token
         session: Database session
+        scope: Required `scope` claim; None accepts only unscoped access tokens
         
     Returns:
-        Current user
+        User (or Principal) the token was issued to
         
     Raises:
-        HTTPException: If authentication fails
+        HTTPException: If the token is invalid, revoked or of the wrong scope,
+            or the user no longer exists
     """
-    token = credentials.credentials
     payload = verify_token(token)
+    if payload.get("scope") != scope:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
     user_id = payload.get("sub")
     if user_id is None:
@@ -139,18 +424,106 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user ID in token"
         )
-
-    user = session.get(User, user_id_int)
+    
+    revoked_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    generation = payload.get("gen", 0)
+    if revocations.is_revoked(user_id_int, generation):
+        raise revoked_exception
+    
+    if settings.AUTH_STATELESS_PRINCIPAL:
+        return Principal(
+            id=user_id_int,
+            username=payload.get("username", ""),
+            token_generation=generation
+        )
+    
+    if settings.AUTH_CACHE_ENABLED:
+        principal = principal_cache.get_nowait(principal_key(user_id_int))
+        if principal is not None:
+            if generation < principal["token_generation"]:
+                raise revoked_exception
+            return User(**principal)
+    
+    user = await session.get(User, user_id_int)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
+    if generation < user.token_generation:
+        raise revoked_exception
     
+    if settings.AUTH_CACHE_ENABLED:
+        principal_cache.set_nowait(principal_key(user.id), {
+            "id": user.id,
+            "email": user.email,
+            "username": user.username,
+            "created_at": user.created_at,
+            "token_generation": user.token_generation,
+        })
     return user
 
 
-def verify_user_access(current_user: User, requested_user_id: int) -> None:
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+) -> Union[User, Principal]:
+    """
+    Get the current authenticated user from JWT token.
+    
+    Args:
+        credentials: HTTP Bearer credentials
+        session: Database session
+        
+    Returns:
+        Current user
+        
+    Raises:
+        HTTPException: If authentication fails
+    """
+    return await get_user_from_token(credentials.credentials, session)
+
+
+async def get_stream_user(
+    token: Optional[str] = Query(default=None, description="Stream token for clients that cannot set headers (EventSource)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    session: AsyncSession = Depends(get_async_session)
+) -> Union[User, Principal]:
+    """
+    Get the current user for streaming endpoints.
+    
+    Browsers' EventSource cannot send an Authorization header, so a stream
+    token (see `create_stream_token`) may be passed as the `token` query
+    parameter instead. Access tokens are only accepted in the header, which
+    keeps them out of access and proxy logs.
+    
+    Args:
+        token: Stream token from the query string
+        credentials: HTTP Bearer credentials, if sent
+        session: Database session
+        
+    Returns:
+        Current user
+        
+    Raises:
+        HTTPException: If authentication fails
+    """
+    if credentials is not None:
+        return await get_user_from_token(credentials.credentials, session)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await get_user_from_token(token, session, scope=STREAM_TOKEN_SCOPE)
+
+
+def verify_user_access(current_user: Union[User, Principal], requested_user_id: int) -> None:
     """
     Verify that the current user has access to the requested user's resources.
     
@@ -0,0 +1,338 @@
+"""
+Token-budgeted conversation history for chat turns.
+
+Each turn sends the system prompt, the conversation's rolling summary and
+the most recent messages that fit in CHAT_CONTEXT_TOKEN_BUDGET estimated
+tokens. Only messages after `Conversation.summary_message_id` are read, at
+most CHAT_CONTEXT_MAX_MESSAGES of them, so the work per turn stays flat no
+matter how long the conversation gets.
+
+When history no longer fits, `fold_history` runs after the response has
+been sent: it asks the model to merge the oldest unsummarized messages into
+the summary and advances the marker, keeping the newest
+CHAT_SUMMARY_KEEP_TOKENS of history verbatim.
+
+The prepared history of recently active conversations is kept in a
+bounded LRU (`history_cache`), so a worker that handled the previous turn
+only appends the new messages instead of reading them back. Every write to
+a conversation (user message, assistant reply, summary) moves
+`Conversation.updated_at` forward with a compare-and-swap; a cached entry is
+used only while its stamp still matches, which invalidates it when another
+worker has written to the conversation in the meantime.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from openai import AsyncOpenAI
+from sqlalchemy import func, update
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.cache import InMemoryLRUCache
+from app.config import settings
+from app.database import async_engine
+from app.models import Conversation, Message
+
+
+# Per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# One model-ready message: {"id", "role", "content", "tokens"}
+HistoryEntry = Dict[str, Any]
+
+# conversation id -> {"stamp", "summary_message_id", "entries"}
+history_cache = InMemoryLRUCache(
+    max_entries=settings.CHAT_HISTORY_CACHE_MAX_ENTRIES,
+    ttl=settings.CHAT_HISTORY_CACHE_TTL_SECONDS
+)
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and their task management assistant.
+Merge the new messages into the current summary. Keep what later turns may need: tasks mentioned (with titles and IDs), actions taken, user preferences and open questions. Drop small talk. Reply with the updated summary only, in at most {max_words} words."""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of `text` without a tokenizer.
+
+    BPE tokenizers average about four bytes of English text per token;
+    counting UTF-8 bytes rather than characters keeps the estimate on the
+    safe side for non-Latin scripts and emoji.
+    """
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def history_entry(message: Message) -> HistoryEntry:
+    """Prepare a stored message for the model, with its estimated token count."""
+    return {
+        "id": message.id,
+        # Tool call history is not replayed; the text content keeps the context
+        "role": "user" if message.role == "user" else "assistant",
+        "content": message.content or "",
+        "tokens": estimate_tokens(message.content or "") + MESSAGE_OVERHEAD_TOKENS,
+    }
+
+
+async def recent_history(session: AsyncSession, conversation: Conversation) -> List[HistoryEntry]:
+    """Messages after the summary marker, oldest first, at most CHAT_CONTEXT_MAX_MESSAGES."""
+    statement = (
+        select(Message)
+        .where(
+            Message.conversation_id == conversation.id,
+            Message.id > (conversation.summary_message_id or 0)
+        )
+        .order_by(Message.id.desc())
+        .limit(settings.CHAT_CONTEXT_MAX_MESSAGES)
+    )
+    messages = (await session.exec(statement)).all()
+    return [history_entry(message) for message in reversed(messages)]
+
+
+def take_within_budget(entries: Sequence[HistoryEntry], budget: int) -> List[HistoryEntry]:
+    """Leading entries whose estimated tokens fit in `budget` (always at least one)."""
+    kept = []
+    used = 0
+    for entry in entries:
+        used += entry["tokens"]
+        if kept and used > budget:
+            break
+        kept.append(entry)
+    return kept
+
+
+def history_key(conversation_id: int) -> str:
+    return f"conversation:{conversation_id}"
+
+
+async def touch_conversation(
+    session: AsyncSession,
+    conversation_id: int,
+    expected: datetime
+) -> Tuple[datetime, bool]:
+    """
+    Move the conversation's `updated_at` stamp forward.
+
+    Args:
+        session: Database session (the caller commits)
+        conversation_id: Conversation written to
+        expected: Stamp the caller last saw
+
+    Returns:
+        (new stamp, whether the stamp was still `expected`, i.e. nobody else
+        wrote to the conversation in between)
+    """
+    stamp = max(datetime.utcnow(), expected + timedelta(microseconds=1))
+    result = await session.exec(
+        update(Conversation)
+        .where(Conversation.id == conversation_id, Conversation.updated_at == expected)
+        .values(updated_at=stamp)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        return stamp, True
+
+    await session.exec(
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(updated_at=stamp)
+        .execution_options(synchronize_session=False)
+    )
+    return stamp, False
+
+
+def cached_history(conversation: Conversation) -> Optional[List[HistoryEntry]]:
+    """Cached history, if stored at the conversation's current stamp and summary marker."""
+    cached = history_cache.get_nowait(history_key(conversation.id))
+    if (
+        cached is None
+        or cached["stamp"] != conversation.updated_at
+        or cached["summary_message_id"] != conversation.summary_message_id
+    ):
+        return None
+    return cached["entries"]
+
+
+def store_history(
+    conversation_id: int,
+    stamp: datetime,
+    summary_message_id: Optional[int],
+    entries: List[HistoryEntry]
+) -> None:
+    history_cache.set_nowait(history_key(conversation_id), {
+        "stamp": stamp,
+        "summary_message_id": summary_message_id,
+        "entries": entries[-settings.CHAT_CONTEXT_MAX_MESSAGES:],
+    })
+
+
+async def start_history(
+    session: AsyncSession,
+    conversation: Conversation,
+    user_message: Message
+) -> Optional[List[HistoryEntry]]:
+    """
+    Record a new user message in an existing conversation.
+
+    Bumps the conversation stamp (in the caller's transaction) and returns
+    the cached history with the message appended, or None if the history
+    has to be read from the database.
+    """
+    entries = cached_history(conversation)
+    stamp, unchanged = await touch_conversation(session, conversation.id, conversation.updated_at)
+    set_committed_value(conversation, "updated_at", stamp)
+    if entries is None or not unchanged:
+        return None
+    return entries + [history_entry(user_message)]
+
+
+async def finish_history(
+    session: AsyncSession,
+    conversation_id: int,
+    stamp: datetime,
+    assistant_message: Message
+) -> None:
+    """
+    Record the assistant's reply: bump the stamp and append to the cache.
+
+    Args:
+        session: Database session (the caller commits)
+        conversation_id: Conversation the reply belongs to
+        stamp: Conversation stamp at the start of the turn
+        assistant_message: Saved (flushed) reply
+    """
+    new_stamp, unchanged = await touch_conversation(session, conversation_id, stamp)
+    key = history_key(conversation_id)
+    cached = history_cache.get_nowait(key)
+    if cached is not None and unchanged and cached["stamp"] == stamp:
+        store_history(
+            conversation_id, new_stamp, cached["summary_message_id"],
+            cached["entries"] + [history_entry(assistant_message)]
+        )
+    else:
+        history_cache.delete_nowait(key)
+
+
+async def build_context(
+    session: AsyncSession,
+    conversation: Conversation,
+    system_prompt: str,
+    history: Optional[List[HistoryEntry]] = None
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Build the message list for a chat turn.
+
+    Args:
+        session: Database session
+        conversation: Conversation being continued (its new user message already saved)
+        system_prompt: Formatted system prompt
+        history: Prepared history from `start_history`, or None to read it
+
+    Returns:
+        (messages for OpenAI, whether older history was left out and should be folded)
+    """
+    messages: List[Dict[str, Any]] = [{"role": "system", "content": system_prompt}]
+    if conversation.summary:
+        messages.append({
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{conversation.summary}"
+        })
+
+    if history is None:
+        history = await recent_history(session, conversation)
+    store_history(conversation.id, conversation.updated_at, conversation.summary_message_id, history)
+    history = history[-settings.CHAT_CONTEXT_MAX_MESSAGES:]
+
+    kept = take_within_budget(history[::-1], settings.CHAT_CONTEXT_TOKEN_BUDGET)
+    overflow = len(kept) < len(history) or len(history) == settings.CHAT_CONTEXT_MAX_MESSAGES
+
+    messages.extend(
+        {"role": entry["role"], "content": entry["content"]}
+        for entry in reversed(kept) if entry["content"]
+    )
+    return messages, overflow
+
+
+def format_transcript(entries: Sequence[HistoryEntry]) -> str:
+    return "\n".join(
+        f"{'User' if entry['role'] == 'user' else 'Assistant'}: {entry['content']}"
+        for entry in entries if entry["content"]
+    )
+
+
+async def fold_history(client: AsyncOpenAI, conversation_id: int) -> None:
+    """
+    Merge the oldest unsummarized messages into the conversation summary.
+
+    Folds at most one budget's worth of messages per call, so a backlog is
+    worked off over the following turns. Runs after the response is sent
+    and owns its own session; failures leave the conversation unchanged.
+    """
+    try:
+        async with AsyncSession(async_engine) as session:
+            conversation = await session.get(Conversation, conversation_id)
+            if conversation is None:
+                return
+            marker = conversation.summary_message_id or 0
+
+            # Keep the newest messages verbatim; everything older gets folded
+            keep = take_within_budget(
+                (await recent_history(session, conversation))[::-1],
+                settings.CHAT_SUMMARY_KEEP_TOKENS
+            )
+            if not keep:
+                return
+            statement = (
+                select(Message)
+                .where(
+                    Message.conversation_id == conversation_id,
+                    Message.id > marker,
+                    Message.id < keep[-1]["id"]
+                )
+                .order_by(Message.id)
+                .limit(settings.CHAT_CONTEXT_MAX_MESSAGES)
+            )
+            oldest_first = [history_entry(message) for message in (await session.exec(statement)).all()]
+            batch = take_within_budget(oldest_first, settings.CHAT_CONTEXT_TOKEN_BUDGET)
+            if not batch:
+                return
+
+            response = await client.chat.completions.create(
+                model=settings.OPENROUTER_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": SUMMARY_PROMPT.format(max_words=settings.CHAT_SUMMARY_MAX_TOKENS * 3 // 4)
+                    },
+                    {
+                        "role": "user",
+                        "content": (
+                            f"Current summary:\n{conversation.summary or '(none)'}\n\n"
+                            f"New messages:\n{format_transcript(batch)}"
+                        )
+                    }
+                ],
+                max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS
+            )
+            summary = (response.choices[0].message.content or "").strip()
+            if not summary:
+                return
+
+            # Compare-and-swap on the marker so concurrent folds cannot go backwards;
+            # moving the stamp invalidates cached history in every worker
+            await session.exec(
+                update(Conversation)
+                .where(
+                    Conversation.id == conversation_id,
+                    func.coalesce(Conversation.summary_message_id, 0) == marker
+                )
+                .values(
+                    summary=summary[:5000],
+                    summary_message_id=batch[-1]["id"],
+                    updated_at=datetime.utcnow()
+                )
+            )
+            await session.commit()
+            history_cache.delete_nowait(history_key(conversation_id))
+    except Exception as e:
+        print(f"Conversation summary failed: {e}")
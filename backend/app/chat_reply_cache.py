@@ -0,0 +1,85 @@
+"""
+Cached assistant replies for read-only chat turns.
+
+Questions like "what's on my list?" are asked over and over, and each one
+costs one or two model calls even when the user's tasks have not changed.
+A turn in which the model only called read-only tools (READ_ONLY_TOOLS) is
+stored under the user, the conversation, the model, the user's task
+collection version and the normalized prompt. Every task write bumps the version (see
+`record_task_change`), whether it comes from the task API or a chat tool, so
+a write makes the old entries unreachable and they age out of the bounded
+LRU.
+
+Replies are only reused within the conversation they were given in, since
+a follow-up such as "and the completed ones?" depends on the earlier turns.
+CHAT_REPLY_CACHE_TTL_SECONDS bounds how long a reply that mentions
+relative dates can be served.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.cache import CacheBackend, InMemoryLRUCache
+from app.config import settings
+from app.mcp_tools import READ_ONLY_TOOLS
+from app.task_changes import get_task_version
+
+
+reply_cache: CacheBackend = InMemoryLRUCache(
+    max_entries=settings.CHAT_REPLY_CACHE_MAX_ENTRIES,
+    ttl=settings.CHAT_REPLY_CACHE_TTL_SECONDS
+)
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_prompt(text: str) -> str:
+    """Lowercase words only, so case, spacing and punctuation do not matter."""
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def reply_key(user_id: int, conversation_id: int, model: str, version: int, prompt: str) -> str:
+    digest = hashlib.sha256(f"{model}\0{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+    return f"reply:{user_id}:{conversation_id}:{version}:{digest[:32]}"
+
+
+async def lookup_reply(
+    session: AsyncSession,
+    user_id: int,
+    conversation_id: int,
+    model: str,
+    prompt: str
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Look up a cached reply to `prompt` at the user's current task version.
+
+    Args:
+        session: Database session (reads the task collection version)
+        user_id: Owner of the tasks
+        conversation_id: Conversation the prompt was sent in
+        model: Model that would answer
+        prompt: The user's message
+
+    Returns:
+        (cache key to store the turn's reply under, or None if the cache is
+        disabled; cached {"response", "tool_calls"} or None)
+    """
+    if not settings.CHAT_REPLY_CACHE_ENABLED:
+        return None, None
+    key = reply_key(user_id, conversation_id, model, await get_task_version(session, user_id), prompt)
+    return key, await reply_cache.get(key)
+
+
+async def store_reply(
+    key: Optional[str],
+    response: Optional[str],
+    tool_calls: List[Dict[str, Any]]
+) -> None:
+    """Cache a turn's reply if it only used read-only tools, all successfully."""
+    if key is None or not response or not tool_calls:
+        return
+    if all(tc["tool_name"] in READ_ONLY_TOOLS and tc["output"]["success"] for tc in tool_calls):
+        await reply_cache.set(key, {"response": response, "tool_calls": tool_calls})
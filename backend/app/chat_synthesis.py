@@ -0,0 +1,111 @@
+"""
+Template replies for chat turns whose tool result speaks for itself.
+
+After tools run, the model is normally called a second time only to phrase
+the answer. When a turn made a single, successful tool call whose result
+message is already user-ready ("✅ Task created: Buy groceries"),
+`reply_synthesis.template_reply` renders the reply directly and the second
+call is skipped, roughly halving latency and token spend for those turns.
+
+CHAT_REPLY_TEMPLATES chooses the tools this applies to:
+
+- "off": always ask the model
+- "writes": task changes and task stats, whose messages are complete sentences
+- "all": also lists and search results, rendered as a numbered list
+
+Turns with several tool calls or a failed call always go to the model, which
+can combine results and explain errors.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+
+# Tools whose result message is the reply
+MESSAGE_TEMPLATE_TOOLS = frozenset({
+    "add_task", "complete_task", "delete_task", "update_task", "get_task_stats"
+})
+# Tools whose result data is rendered as a task list
+LIST_TEMPLATE_TOOLS = frozenset({"list_tasks", "search_tasks"})
+
+
+def task_list_reply(tool_name: str, output: Dict[str, Any]) -> str:
+    """Render a list_tasks/search_tasks result as a numbered list."""
+    tasks = output.get("data") or []
+    if not tasks:
+        return "No tasks match your search." if tool_name == "search_tasks" else "You have no tasks here yet."
+    lines = [f"{output['message'].rstrip('.')}:"]
+    lines.extend(
+        f"{number}. {'✅ ' if task['completed'] else ''}{task['title']} (#{task['id']})"
+        for number, task in enumerate(tasks, 1)
+    )
+    return "\n".join(lines)
+
+
+class ReplySynthesis:
+    """Decides how a tool turn's reply is produced and counts the outcomes."""
+
+    def __init__(self):
+        self.templated = 0
+        self.model = 0
+        self.model_seconds = 0.0
+        self.fallbacks: Dict[str, int] = {"multiple_tools": 0, "failed": 0, "policy": 0}
+
+    def template_tools(self) -> frozenset:
+        policy = settings.CHAT_REPLY_TEMPLATES
+        if policy == "all":
+            return MESSAGE_TEMPLATE_TOOLS | LIST_TEMPLATE_TOOLS
+        if policy == "writes":
+            return MESSAGE_TEMPLATE_TOOLS
+        return frozenset()
+
+    def template_reply(self, tool_calls: List[Optional[Dict[str, Any]]]) -> Optional[str]:
+        """
+        Render the reply for a tool turn without the model, if the policy allows.
+
+        Args:
+            tool_calls: Tool call info per call (None for an unknown tool)
+
+        Returns:
+            The reply, or None if the model has to write it
+        """
+        if len(tool_calls) != 1:
+            self.fallbacks["multiple_tools"] += 1
+            return None
+        info = tool_calls[0]
+        if info is None or not info["output"]["success"]:
+            self.fallbacks["failed"] += 1
+            return None
+        tool_name = info["tool_name"]
+        if tool_name not in self.template_tools():
+            self.fallbacks["policy"] += 1
+            return None
+
+        self.templated += 1
+        if tool_name in LIST_TEMPLATE_TOOLS:
+            return task_list_reply(tool_name, info["output"])
+        return info["output"]["message"]
+
+    def record_model_reply(self, started: float) -> None:
+        """Count a reply written by a second model call that began at `started` (perf_counter)."""
+        self.model += 1
+        self.model_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.templated + self.model
+        avg_model_ms = self.model_seconds / self.model * 1000 if self.model else 0.0
+        return {
+            "policy": settings.CHAT_REPLY_TEMPLATES,
+            "templated": self.templated,
+            "model": self.model,
+            "template_rate": self.templated / total if total else 0.0,
+            "fallbacks": dict(self.fallbacks),
+            "avg_model_reply_ms": avg_model_ms,
+            # Model time the templated turns would have spent at the current average
+            "estimated_saved_ms": avg_model_ms * self.templated,
+        }
+
+
+reply_synthesis = ReplySynthesis()
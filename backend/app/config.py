@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Literal
 from functools import lru_cache
 
 
@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DATABASE_ECHO: bool = True  # Log SQL queries (disable in production)
     
     # JWT
     JWT_SECRET_KEY: str
@@ -15,6 +16,45 @@ class Settings(BaseSettings):
     JWT_EXPIRATION_MINUTES: int = 60 * 24  # 24 hours
     ACESS_TOKEN_EXPIRE_MINUTES: int = 30 # Fixed typo in variable name if it existed, but using standard one
     
+    # Authentication caches (decoded tokens and user principals)
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_PRINCIPAL_TTL_SECONDS: float = 60.0
+    # Authenticate from token claims alone (no users-table lookup per request)
+    AUTH_STATELESS_PRINCIPAL: bool = False
+    AUTH_REVOCATION_REFRESH_SECONDS: float = 30.0
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    
+    # Task list pagination
+    TASKS_PAGE_DEFAULT_LIMIT: int = 50
+    TASKS_PAGE_MAX_LIMIT: int = 200
+    TASKS_BATCH_MAX_OPERATIONS: int = 500
+    TASKS_IMPORT_BATCH_SIZE: int = 1000  # Rows per INSERT/COPY and commit during imports
+    TASKS_FAST_JSON: bool = False  # Serialize task lists with orjson from column tuples
+    
+    # Task read cache
+    TASK_CACHE_ENABLED: bool = True
+    TASK_CACHE_MAX_ENTRIES: int = 10000
+    TASK_CACHE_TTL_SECONDS: float = 60.0
+    
+    # Task delta sync
+    TASK_SYNC_OVERLAP_SECONDS: int = 5  # Re-send changes this recent to cover late commits
+    TASK_TOMBSTONE_RETENTION_DAYS: int = 30
+    TASK_TOMBSTONE_COMPACTION_INTERVAL_SECONDS: int = 3600
+    
+    # Task change push channel (SSE)
+    TASK_EVENTS_QUEUE_SIZE: int = 64  # Undelivered events per connection before forcing a resync
+    TASK_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    TASK_EVENTS_TOKEN_EXPIRE_SECONDS: int = 60  # Lifetime of the stream tokens EventSource sends in the URL
+    
+    # Data export
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched per server-side cursor round trip
+    
     # CORS
     CORS_ORIGINS: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -28,6 +68,35 @@ class Settings(BaseSettings):
     OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
     OPENROUTER_MODEL: str = "meta-llama/llama-3.3-70b-instruct:free"
     
+    # Shared HTTP client for the AI provider (created once per process)
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    LLM_TIMEOUT_SECONDS: float = 120.0  # Read/write/pool timeout; completions can be slow
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_HTTP2: bool = True
+    
+    # Chat context window
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 3000  # Estimated tokens of history sent per turn
+    CHAT_CONTEXT_MAX_MESSAGES: int = 50  # Rows read per turn, whatever their size
+    CHAT_SUMMARY_ENABLED: bool = True  # Fold older turns into Conversation.summary
+    CHAT_SUMMARY_KEEP_TOKENS: int = 1500  # Recent history kept verbatim after folding
+    CHAT_SUMMARY_MAX_TOKENS: int = 400
+    CHAT_HISTORY_CACHE_MAX_ENTRIES: int = 1000  # Conversations whose prepared history is cached
+    CHAT_HISTORY_CACHE_TTL_SECONDS: float = 900.0
+    # Reply to single successful tool calls from templates instead of a second model call
+    CHAT_REPLY_TEMPLATES: Literal["off", "writes", "all"] = "writes"
+    CHAT_INTENT_FAST_PATH: bool = True  # Run literal commands ("delete task 7") without the model
+    CHAT_REPLY_CACHE_ENABLED: bool = True  # Reuse replies to read-only turns until tasks change
+    CHAT_REPLY_CACHE_MAX_ENTRIES: int = 2000
+    CHAT_REPLY_CACHE_TTL_SECONDS: float = 600.0
+    
+    # Report db/llm/tool time per request in a Server-Timing header (for load tests)
+    SERVER_TIMING_ENABLED: bool = False
+    
+    # Serve runtime counters at GET /api/metrics (unauthenticated; trusted networks only)
+    METRICS_ENABLED: bool = False
+    
     # User specific aliases (found in .env)
     OPEN_ROUTER: str = ""
     BASE_URL: str = ""
@@ -1,7 +1,10 @@
 from contextvars import ContextVar
 from typing import Optional
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Context variables to hold request-scoped data
-session_context: ContextVar[Optional[Session]] = ContextVar("session_context", default=None)
+session_context: ContextVar[Optional[AsyncSession]] = ContextVar("session_context", default=None)
 user_id_context: ContextVar[Optional[int]] = ContextVar("user_id_context", default=None)
+# Set while a chat turn runs its tool calls as one unit of work: write tools
+# only flush, and the turn commits (or rolls back) once at the end
+unit_of_work_context: ContextVar[bool] = ContextVar("unit_of_work_context", default=False)
@@ -1,27 +1,129 @@
 from sqlmodel import create_engine, SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from app.config import settings
-from typing import Generator
+from app.search import install_search_index
+from typing import AsyncGenerator, Generator, Tuple
 
 
-# Create database engine
+def _to_async_url(database_url: str) -> Tuple[str, dict]:
+    """
+    Translate a sync DATABASE_URL into its async-driver equivalent.
+
+    psycopg2 style ``sslmode``/``channel_binding`` query parameters are not
+    understood by asyncpg, so they are stripped and mapped to ``connect_args``.
+
+    Args:
+        database_url: Database URL as configured in the environment
+
+    Returns:
+        Tuple of (async database URL, connect_args for the async engine)
+    """
+    url = make_url(database_url)
+    connect_args = {}
+
+    if url.drivername in ("postgresql", "postgresql+psycopg2", "postgres"):
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode and sslmode != "disable":
+            connect_args["ssl"] = "require"
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    elif url.drivername in ("sqlite", "sqlite+pysqlite"):
+        url = url.set(drivername="sqlite+aiosqlite")
+
+    return url.render_as_string(hide_password=False), connect_args
+
+
+# Create database engine (sync; used by scripts and table creation tooling)
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=True,  # Log SQL queries (disable in production)
+    echo=settings.DATABASE_ECHO,  # Log SQL queries (disable in production)
     pool_pre_ping=True,  # Verify connections before using
 )
 
+# Create async database engine (used by all request handlers)
+_async_url, _async_connect_args = _to_async_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    _async_url,
+    echo=settings.DATABASE_ECHO,
+    pool_pre_ping=True,
+    connect_args=_async_connect_args,
+)
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """
+    Bring tables created by an older release up to date.
+
+    `create_all` only creates missing tables, so columns and indexes added to
+    existing models are created here. New columns must be nullable or carry a
+    server_default.
+
+    Args:
+        connection: Sync connection inside an open transaction
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+            if column.server_default is not None:
+                default = column.server_default.arg
+                ddl += f" DEFAULT {getattr(default, 'text', default)}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            connection.exec_driver_sql(ddl)
+
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(connection)
+
 
 def create_db_and_tables():
     """Create all database tables."""
     SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        upgrade_schema(connection)
+        install_search_index(connection)
+
+
+async def create_db_and_tables_async():
+    """Create all database tables without blocking the event loop."""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+        await conn.run_sync(install_search_index)
 
 
 def get_session() -> Generator[Session, None, None]:
     """
-    Dependency to get database session.
-    
+    Get a synchronous database session (scripts and tooling only).
+
     Yields:
         Session: SQLModel database session
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session.
+
+    Yields:
+        AsyncSession: SQLModel async database session
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,126 @@
+"""
+Per-user publish/subscribe for task change notifications.
+
+`commit_task_changes` publishes one compact event per user after every task
+write; the SSE endpoint subscribes on behalf of each connected client.
+
+`InMemoryBroker` fans events out to subscribers in the same worker. Each
+subscriber is just a bounded queue, so thousands of idle connections cost a
+few hundred bytes each and publishing never blocks on a slow client: when a
+queue is full its backlog is dropped and replaced by a single `resync` event.
+To fan out across several workers, subclass it so `publish` forwards events
+to a shared channel (e.g. Redis pub/sub or PostgreSQL LISTEN/NOTIFY) and a
+listener in every worker hands them to `deliver`, then install it with
+`set_task_event_broker`.
+"""
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from app.config import settings
+
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+def sse_message(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Events message."""
+    lines = [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    if event_id is not None:
+        lines.insert(0, f"id: {event_id}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    """A subscriber's view of one user's event stream."""
+
+    def __init__(self, user_id: int, max_queued: int):
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queued)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the next event; None if nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker(ABC):
+    """Interface for task event brokers."""
+
+    @abstractmethod
+    async def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        """Send an event to every subscriber of `user_id`."""
+
+    @abstractmethod
+    def subscribe(self, user_id: int) -> "AsyncIterator[Subscription]":
+        """Async context manager yielding a Subscription for `user_id`."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return subscriber and delivery counters."""
+
+
+class InMemoryBroker(Broker):
+    """Fan-out to subscribers in this worker process."""
+
+    def __init__(self, max_queued: int = 64):
+        self.max_queued = max_queued
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    def deliver(self, user_id: int, event: Dict[str, Any]) -> None:
+        """Queue an event for the user's local subscribers without blocking."""
+        for subscription in self._subscribers.get(user_id, ()):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: it has to resync anyway, so drop its backlog
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(RESYNC_EVENT)
+                self.overflows += 1
+            else:
+                self.delivered += 1
+
+    async def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        self.published += 1
+        self.deliver(user_id, event)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[Subscription]:
+        subscription = Subscription(user_id, self.max_queued)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "broker": "memory",
+            "users": len(self._subscribers),
+            "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+task_events: Broker = InMemoryBroker(max_queued=settings.TASK_EVENTS_QUEUE_SIZE)
+
+
+def set_task_event_broker(broker: Broker) -> None:
+    """Swap in a different broker (e.g. one shared across workers)."""
+    global task_events
+    task_events = broker
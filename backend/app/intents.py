@@ -0,0 +1,206 @@
+"""
+Rule-based recognition of literal chat commands.
+
+Much of the chat traffic is plain commands such as "add task buy milk",
+"complete 12", "delete task 7" or "show my pending tasks". `parse_intent`
+recognizes those with anchored patterns, so the chat router can run the
+tool directly and answer in milliseconds without calling the model.
+
+The patterns must match the whole message. Anything they do not cover, such
+as compound requests ("add milk and delete task 3"), negations, several
+task IDs or vague references ("delete the groceries one"), falls through to
+the model. A miss only costs one model call, but a false match runs the
+wrong command, so the patterns err on the side of not matching. Check
+changes against `benchmarks/intent_corpus.jsonl` with
+`python -m benchmarks.eval_intents`.
+"""
+
+import re
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.chat_synthesis import task_list_reply
+from app.config import settings
+
+
+class Intent(NamedTuple):
+    """A recognized command and the tool call that carries it out."""
+    name: str
+    tool_name: str
+    arguments: Dict[str, Any]
+
+
+_POLITE = r"(?:(?:please|pls|can you|could you|would you)\s+)?"
+_END = r"(?:\s*,?\s*(?:please|pls|thanks|thank you))?\s*[.!?]*"
+# After a free-text title the courtesy must be set off by punctuation, or
+# "add task say thanks" would lose part of its title
+_TITLE_END = r"(?:\s*[,.!]\s*(?:please|pls|thanks|thank you))?\s*[.!?]*"
+_TASK = r"(?:task|todo|to-do|item)"
+_TASK_ID = rf"(?:(?:the\s+)?{_TASK}\s*)?(?:number\s+|no\.?\s*)?#?(?P<task_id>\d{{1,9}})"
+_DONE = r"(?:done|complete|completed|finished)"
+_NOT_DONE = r"(?:not\s+done|undone|incomplete|not\s+complete|pending|open)"
+
+_PATTERNS = [
+    ("add", re.compile(
+        rf"{_POLITE}(?:add|create)\s+(?:a\s+)?(?:new\s+)?{_TASK}\b\s*(?:[:\-]\s*|(?:called|named|to)\s+)?"
+        rf"(?P<title>.+?){_TITLE_END}",
+        re.IGNORECASE
+    )),
+    ("add", re.compile(
+        rf"{_POLITE}(?:new\s+{_TASK}|todo)\s*:\s*(?P<title>.+?){_TITLE_END}",
+        re.IGNORECASE
+    )),
+    ("add", re.compile(
+        rf"{_POLITE}add\s+(?P<title>.+?)\s+to\s+(?:my\s+)?(?:tasks|todos|to-dos|(?:task|todo|to-do)\s+list|list)"
+        rf"{_END}",
+        re.IGNORECASE
+    )),
+    ("complete", re.compile(
+        rf"{_POLITE}(?:complete|finish|close|check\s+off|tick\s+off)\s+{_TASK_ID}{_END}",
+        re.IGNORECASE
+    )),
+    ("complete", re.compile(
+        rf"{_POLITE}mark\s+{_TASK_ID}\s+(?:as\s+)?{_DONE}{_END}",
+        re.IGNORECASE
+    )),
+    ("complete", re.compile(
+        rf"{_TASK}\s*#?(?P<task_id>\d{{1,9}})\s+(?:is\s+)?{_DONE}{_END}",
+        re.IGNORECASE
+    )),
+    ("reopen", re.compile(
+        rf"{_POLITE}(?:reopen|re-open|uncomplete|unmark)\s+{_TASK_ID}{_END}",
+        re.IGNORECASE
+    )),
+    ("reopen", re.compile(
+        rf"{_POLITE}mark\s+{_TASK_ID}\s+(?:as\s+)?{_NOT_DONE}{_END}",
+        re.IGNORECASE
+    )),
+    ("delete", re.compile(
+        rf"{_POLITE}(?:delete|remove|erase|drop)\s+{_TASK_ID}{_END}",
+        re.IGNORECASE
+    )),
+    ("list", re.compile(
+        rf"{_POLITE}(?:(?:show|list|display|view|get|give)\s+(?:me\s+)?|what\s+are\s+)?(?:all\s+)?(?:of\s+)?"
+        rf"(?:my\s+|the\s+)?(?:(?P<status>pending|open|incomplete|unfinished|remaining|outstanding|active"
+        rf"|completed|done|finished|closed)\s+)?(?:tasks|todos|to-dos|(?:task|todo|to-do)\s+list){_END}",
+        re.IGNORECASE
+    )),
+]
+
+# A title that carries another command belongs to a compound request
+_COMPOUND = re.compile(
+    r"\b(?:and|then|also)\s+(?:add|create|complete|finish|delete|remove|mark|show|list|update|rename)\b"
+    r"|\b(?:and|then|also)\s+(?:task|todo)\s*#?\d",
+    re.IGNORECASE
+)
+# Left over from the command itself ("add task to", "add task please"), not a title
+_NOT_A_TITLE = {
+    "a", "an", "the", "to", "for", "it", "this", "that", "called", "named", "new", "task", "todo",
+    "please", "pls", "thanks", "thank you"
+}
+_COMPLETED_STATUSES = {"completed", "done", "finished", "closed"}
+_MAX_TITLE_LENGTH = 255
+
+
+def parse_intent(text: str) -> Optional[Intent]:
+    """
+    Recognize a literal task command.
+
+    Args:
+        text: The user's chat message
+
+    Returns:
+        The intent, or None if the message should go to the model
+    """
+    text = text.strip()
+    if not text or "\n" in text:
+        return None
+
+    for name, pattern in _PATTERNS:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+
+        if name == "add":
+            title = match.group("title").strip().strip("\"'“”‘’").strip()
+            bare = title.lower().strip(" ,;:-.!?")
+            if (
+                not bare
+                or bare in _NOT_A_TITLE
+                or len(title) > _MAX_TITLE_LENGTH
+                or _COMPOUND.search(title)
+            ):
+                return None
+            return Intent(name, "add_task", {"title": title})
+        if name == "list":
+            status = match.group("status")
+            arguments = {} if status is None else {"completed": status.lower() in _COMPLETED_STATUSES}
+            return Intent(name, "list_tasks", arguments)
+
+        task_id = int(match.group("task_id"))
+        if name == "delete":
+            return Intent(name, "delete_task", {"task_id": task_id})
+        # update_task sets the state; complete_task would toggle an already finished task back open
+        return Intent(name, "update_task", {"task_id": task_id, "completed": name == "complete"})
+
+    return None
+
+
+def intent_reply(intent: Intent, output: Dict[str, Any]) -> str:
+    """Render the reply to a command from its tool result."""
+    if not output["success"]:
+        if output["error"] == "Task not found":
+            return f"I couldn't find task #{intent.arguments['task_id']}."
+        return f"❌ {output['error']}"
+
+    if intent.name == "list":
+        return task_list_reply(intent.tool_name, output)
+    if intent.name == "complete":
+        return f"✅ Task #{intent.arguments['task_id']} completed"
+    if intent.name == "reopen":
+        return f"✅ Task #{intent.arguments['task_id']} reopened"
+    if intent.name == "delete":
+        return f"🗑️ Task #{intent.arguments['task_id']} deleted"
+    return output["message"]
+
+
+class IntentStats:
+    """Counts how many chat messages the fast path answered."""
+
+    def __init__(self):
+        self.messages = 0
+        self.by_intent: Dict[str, int] = {}
+        self.fast_path_seconds = 0.0
+
+    def record(self, intent: Optional[Intent]) -> None:
+        self.messages += 1
+        if intent is not None:
+            self.by_intent[intent.name] = self.by_intent.get(intent.name, 0) + 1
+
+    def record_fast_path(self, started: float) -> None:
+        """Add the time a fast-path turn took since `started` (perf_counter)."""
+        self.fast_path_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        hits = sum(self.by_intent.values())
+        return {
+            "enabled": settings.CHAT_INTENT_FAST_PATH,
+            "messages": self.messages,
+            "hits": hits,
+            "misses": self.messages - hits,
+            "hit_rate": hits / self.messages if self.messages else 0.0,
+            "by_intent": dict(self.by_intent),
+            "avg_fast_path_ms": self.fast_path_seconds / hits * 1000 if hits else 0.0,
+        }
+
+
+intent_stats = IntentStats()
+
+
+def recognize_intent(text: str) -> Optional[Intent]:
+    """Parse a chat message for the fast path and count the outcome; None when it is disabled."""
+    if not settings.CHAT_INTENT_FAST_PATH:
+        return None
+    intent = parse_intent(text)
+    intent_stats.record(intent)
+    return intent
@@ -0,0 +1,128 @@
+"""
+Shared client for the OpenAI-compatible chat provider (OpenRouter).
+
+The client is created once in the application lifespan and stored on
+`app.state.openai_client`, so every chat request reuses the same connection
+pool: TLS handshakes happen once per connection instead of once per request,
+idle connections are kept alive between turns, and with HTTP/2 concurrent
+requests share a single connection.
+"""
+
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Optional
+
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+try:
+    # Newer openai releases are built on httpx2; transports must match the client
+    import httpx2 as httpx
+except ImportError:
+    import httpx
+
+from app.config import Settings
+from app.server_timing import add_timing
+
+
+class TimedStream(httpx.AsyncByteStream):
+    """Response body that reports the request's time as `llm` once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, started: float):
+        self.stream = stream
+        self.started = started
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            add_timing("llm", time.perf_counter() - self.started)
+
+
+class PoolMetricsTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that also reports connection pool utilization."""
+
+    def __init__(self, limits: httpx.Limits, **kwargs: Any):
+        super().__init__(limits=limits, **kwargs)
+        self.max_connections = limits.max_connections
+        self.requests = 0
+        self.connections_opened = 0
+        self._seen: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        started = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            add_timing("llm", time.perf_counter() - started)
+            raise
+        finally:
+            for connection in self._pool.connections:
+                if connection not in self._seen:
+                    self._seen.add(connection)
+                    self.connections_opened += 1
+        # Streamed completions spend most of their time in the body
+        response.stream = TimedStream(response.stream, started)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        connections = self._pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        active = len(connections) - idle
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections": len(connections),
+            "active": active,
+            "idle": idle,
+            "http2": sum(1 for connection in connections if "HTTP/2" in connection.info()),
+            "max_connections": self.max_connections,
+            "utilization": round(active / self.max_connections, 4) if self.max_connections else None,
+        }
+
+
+def create_openai_client(settings: Settings) -> Optional[AsyncOpenAI]:
+    """
+    Build the shared AsyncOpenAI client.
+    
+    Args:
+        settings: Application settings
+        
+    Returns:
+        Configured client, or None if no API key is set
+    """
+    # Priority: OPENROUTER_API_KEY -> OPEN_ROUTER -> GEMINI_API_KEY
+    api_key = settings.OPENROUTER_API_KEY or settings.OPEN_ROUTER or settings.GEMINI_API_KEY
+    # Priority: OPENROUTER_BASE_URL -> BASE_URL -> Default
+    base_url = settings.OPENROUTER_BASE_URL or settings.BASE_URL or "https://openrouter.ai/api/v1"
+    
+    if not api_key:
+        return None
+    
+    transport = PoolMetricsTransport(
+        limits=httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_SECONDS
+        ),
+        http2=settings.LLM_HTTP2
+    )
+    http_client = DefaultAsyncHttpxClient(
+        transport=transport,
+        timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS)
+    )
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+
+def pool_stats(client: Optional[AsyncOpenAI]) -> Dict[str, Any]:
+    """Connection pool counters of the shared client."""
+    if client is None:
+        return {"configured": False}
+    transport = getattr(client._client, "_transport", None)
+    if not isinstance(transport, PoolMetricsTransport):
+        return {"configured": True}
+    return {"configured": True, **transport.stats()}
@@ -1,26 +1,44 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 from app.config import settings
-from app.database import create_db_and_tables
-from app.routers import auth, tasks, chat
+from app.database import async_engine, create_db_and_tables_async
+from app.llm import create_openai_client
+from app.server_timing import ServerTimingMiddleware, install_db_timing
+from app.routers import auth, tasks, chat, export, metrics
+from app.auth import password_hasher, run_revocation_refresh
+from app.task_changes import run_tombstone_compaction
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Application lifespan manager.
-    Creates database tables on startup.
+    Creates database tables, the shared AI client and background maintenance
+    on startup.
     """
     # Startup
     print("Creating database tables...")
-    create_db_and_tables()
+    await create_db_and_tables_async()
     print("Database tables created successfully!")
+    app.state.openai_client = create_openai_client(settings)
+    background_tasks = [asyncio.create_task(run_tombstone_compaction())]
+    if settings.AUTH_STATELESS_PRINCIPAL:
+        background_tasks.append(asyncio.create_task(run_revocation_refresh()))
     
     yield
     
     # Shutdown
     print("Application shutting down...")
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    password_hasher.shutdown()
+    if app.state.openai_client is not None:
+        await app.state.openai_client.close()
+    await async_engine.dispose()
 
 
 # Create FastAPI application
@@ -38,12 +56,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+if settings.SERVER_TIMING_ENABLED:
+    install_db_timing(async_engine)
+    app.add_middleware(ServerTimingMiddleware)
+
 # Register routers
 app.include_router(auth.router)
 app.include_router(tasks.router)
 app.include_router(chat.router)  # Phase III: AI Chatbot
+app.include_router(export.router)
+
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -3,14 +3,22 @@ MCP (Model Context Protocol) Tool Adapters for Task Operations.
 
 These tools wrap existing task CRUD operations to be used by the AI chatbot.
 Each tool is stateless and calls the corresponding task router function.
+
+Within a chat turn the tools run as one unit of work (`unit_of_work_context`):
+writes only flush and the chat router commits them together, while the
+read-only tools in READ_ONLY_TOOLS may run concurrently on their own sessions.
 """
 
 from typing import Dict, Any, Optional
-from sqlmodel import Session, select
-from datetime import datetime
+from sqlmodel import select
 
-from app.models import Task, TaskCreate, TaskUpdate
-from app.database import get_session
+from app.models import Task
+from app.search import search_tasks as run_task_search
+from app.task_cache import serialize_task, task_cache
+from app.task_changes import (
+    commit_task_changes, delete_task_row, get_task_counts, get_task_version,
+    has_pending_changes, record_task_change, toggle_task_row, update_task_row
+)
 
 
 class MCPToolResult:
@@ -31,7 +39,13 @@ class MCPToolResult:
         }
 
 
-from app.context import session_context, user_id_context
+from app.context import session_context, unit_of_work_context, user_id_context
+
+# Tools that never write, so they can run concurrently on separate sessions
+# (get_task_stats may recount and store the counters, so it is not one)
+READ_ONLY_TOOLS = frozenset({"list_tasks", "search_tasks"})
+# Tools that change tasks; if one fails, the others in the turn are rolled back
+WRITE_TOOLS = frozenset({"add_task", "complete_task", "delete_task", "update_task"})
 
 def get_context():
     session = session_context.get()
@@ -40,7 +54,14 @@ def get_context():
         raise ValueError("Context not initialized")
     return session, user_id
 
-def add_task(title: str, description: str = "") -> MCPToolResult:
+async def save_changes(session) -> None:
+    """Commit a tool's write, or just flush it when the chat turn commits for all tools."""
+    if unit_of_work_context.get():
+        await session.flush()
+    else:
+        await commit_task_changes(session)
+
+async def add_task(title: str, description: str = "") -> MCPToolResult:
     """Create a new task for the user."""
     try:
         session, user_id = get_context()
@@ -52,8 +73,8 @@ def add_task(title: str, description: str = "") -> MCPToolResult:
         )
         
         session.add(new_task)
-        session.commit()
-        session.refresh(new_task)
+        await session.flush()
+        await record_task_change(session, user_id, task_ids=[new_task.id], total_delta=1)
         
         task_data = {
             "id": new_task.id,
@@ -62,6 +83,7 @@ def add_task(title: str, description: str = "") -> MCPToolResult:
             "completed": new_task.completed,
             "created_at": new_task.created_at.isoformat()
         }
+        await save_changes(session)
         
         return MCPToolResult(
             success=True,
@@ -71,25 +93,37 @@ def add_task(title: str, description: str = "") -> MCPToolResult:
     except Exception as e:
         return MCPToolResult(success=False, error=str(e))
 
-def list_tasks(completed: bool = None) -> MCPToolResult:
+async def list_tasks(completed: bool = None) -> MCPToolResult:
     """List all tasks, optionally filtered by completion status."""
     try:
         session, user_id = get_context()
         
-        statement = select(Task).where(Task.user_id == user_id)
-        if completed is not None:
-            statement = statement.where(Task.completed == completed)
-        
-        statement = statement.order_by(Task.created_at.desc())
-        tasks = session.exec(statement).all()
+        # Served from the shared per-user task cache; filtering is done here
+        # so every filter variant reuses the same entry. A list read after
+        # this turn's own uncommitted writes bypasses the cache: it must see
+        # them, and must not be cached in case the turn rolls back.
+        cacheable = not has_pending_changes(session, user_id)
+        version = await get_task_version(session, user_id)
+        tasks = await task_cache.get_list(user_id, version) if cacheable else None
+        if tasks is None:
+            statement = (
+                select(Task)
+                .where(Task.user_id == user_id)
+                .order_by(Task.created_at.desc(), Task.id.desc())
+            )
+            tasks = [serialize_task(t) for t in (await session.exec(statement)).all()]
+            if cacheable:
+                await task_cache.set_list(user_id, version, tasks)
         
         task_list = [
             {
-                "id": t.id, 
-                "title": t.title, 
-                "description": t.description, 
-                "completed": t.completed
+                "id": t["id"], 
+                "title": t["title"], 
+                "description": t["description"], 
+                "completed": t["completed"],
+                "version": t["version"]
             } for t in tasks
+            if completed is None or t["completed"] == completed
         ]
         
         return MCPToolResult(
@@ -100,62 +134,113 @@ def list_tasks(completed: bool = None) -> MCPToolResult:
     except Exception as e:
         return MCPToolResult(success=False, error=str(e))
 
-def complete_task(task_id: int) -> MCPToolResult:
+async def search_tasks(query: str, limit: int = 10) -> MCPToolResult:
+    """Find tasks whose title or description matches a search query."""
+    try:
+        session, user_id = get_context()
+        
+        hits = await run_task_search(session, user_id, query, max(1, min(limit, 50)))
+        
+        task_list = [
+            {
+                "id": t.id,
+                "title": t.title,
+                "description": t.description,
+                "completed": t.completed,
+                "version": t.version
+            } for t, _ in hits
+        ]
+        
+        return MCPToolResult(
+            success=True,
+            data=task_list,
+            message=f"Found {len(task_list)} matching tasks."
+        )
+    except Exception as e:
+        return MCPToolResult(success=False, error=str(e))
+
+async def get_task_stats() -> MCPToolResult:
+    """Count the user's tasks: total, completed and pending."""
+    try:
+        session, user_id = get_context()
+        
+        total, completed = await get_task_counts(session, user_id)
+        
+        return MCPToolResult(
+            success=True,
+            data={"total": total, "completed": completed, "pending": total - completed},
+            message=f"You have {total} tasks: {completed} completed, {total - completed} pending."
+        )
+    except Exception as e:
+        return MCPToolResult(success=False, error=str(e))
+
+async def complete_task(task_id: int, expected_version: Optional[int] = None) -> MCPToolResult:
     """Toggle task completion status."""
     try:
         session, user_id = get_context()
-        task = session.get(Task, task_id)
+        toggled = await toggle_task_row(session, user_id, task_id, expected_version)
         
-        if not task or task.user_id != user_id:
+        if toggled is None:
             return MCPToolResult(success=False, error="Task not found")
-            
-        task.completed = not task.completed
-        task.updated_at = datetime.utcnow()
-        session.add(task)
-        session.commit()
+        
+        task, completed_delta = toggled
+        await record_task_change(
+            session, user_id, task_ids=[task_id], completed_delta=completed_delta
+        )
+        await save_changes(session)
         
         return MCPToolResult(
             success=True,
-            data={"id": task.id, "completed": task.completed},
+            data={"id": task.id, "completed": task.completed, "version": task.version},
             message=f"✅ Task {'completed' if task.completed else 'reopened'}"
         )
     except Exception as e:
         return MCPToolResult(success=False, error=str(e))
 
-def delete_task(task_id: int) -> MCPToolResult:
+async def delete_task(task_id: int, expected_version: Optional[int] = None) -> MCPToolResult:
     """Delete a task permanently."""
     try:
         session, user_id = get_context()
-        task = session.get(Task, task_id)
+        completed_delta = await delete_task_row(session, user_id, task_id, expected_version)
         
-        if not task or task.user_id != user_id:
+        if completed_delta is None:
             return MCPToolResult(success=False, error="Task not found")
-            
-        session.delete(task)
-        session.commit()
+        
+        await record_task_change(
+            session, user_id,
+            deleted_ids=[task_id],
+            total_delta=-1,
+            completed_delta=completed_delta
+        )
+        await save_changes(session)
         
         return MCPToolResult(success=True, message="🗑️ Task deleted")
     except Exception as e:
         return MCPToolResult(success=False, error=str(e))
 
-def update_task(task_id: int, title: str = None, description: str = None, completed: bool = None) -> MCPToolResult:
+async def update_task(task_id: int, title: str = None, description: str = None, completed: bool = None, expected_version: Optional[int] = None) -> MCPToolResult:
     """Update a task's details."""
     try:
         session, user_id = get_context()
-        task = session.get(Task, task_id)
+        values = {}
+        if title is not None: values["title"] = title
+        if description is not None: values["description"] = description
         
-        if not task or task.user_id != user_id:
+        updated = await update_task_row(
+            session, user_id, task_id, values,
+            completed=completed,
+            expected_version=expected_version
+        )
+        if updated is None:
             return MCPToolResult(success=False, error="Task not found")
-            
-        if title is not None: task.title = title
-        if description is not None: task.description = description
-        if completed is not None: task.completed = completed
         
-        task.updated_at = datetime.utcnow()
-        session.add(task)
-        session.commit()
+        task, completed_delta = updated
+        await record_task_change(
+            session, user_id, task_ids=[task_id], completed_delta=completed_delta
+        )
+        await save_changes(session)
         
-        return MCPToolResult(success=True, message="✏️ Task updated")
+        return MCPToolResult(success=True, data={"id": task.id, "version": task.version}, message="✏️ Task updated")
     except Exception as e:
         return MCPToolResult(success=False, error=str(e))
 
@@ -165,6 +250,8 @@ def update_task(task_id: int, title: str = None, description: str = None, comple
 GEMINI_TOOLS = [
     add_task,
     list_tasks,
+    search_tasks,
+    get_task_stats,
     complete_task,
     delete_task,
     update_task
@@ -209,6 +296,38 @@ OPENAI_TOOLS = [
             }
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_tasks",
+            "description": "Search tasks by keywords in their title or description. Prefer this over list_tasks when looking for specific tasks.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Keywords to search for."
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of results (default 10)."
+                    }
+                },
+                "required": ["query"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_task_stats",
+            "description": "Count the user's tasks (total, completed, pending) without listing them.",
+            "parameters": {
+                "type": "object",
+                "properties": {}
+            }
+        }
+    },
     {
         "type": "function",
         "function": {
@@ -220,6 +339,10 @@ OPENAI_TOOLS = [
                     "task_id": {
                         "type": "integer",
                         "description": "The ID of the task to complete/reopen."
+                    },
+                    "expected_version": {
+                        "type": "integer",
+                        "description": "Optional. The task's version as returned by list_tasks or search_tasks; the change is rejected if the task was modified since."
                     }
                 },
                 "required": ["task_id"]
@@ -237,6 +360,10 @@ OPENAI_TOOLS = [
                     "task_id": {
                         "type": "integer",
                         "description": "The ID of the task to delete."
+                    },
+                    "expected_version": {
+                        "type": "integer",
+                        "description": "Optional. The task's version as returned by list_tasks or search_tasks; the change is rejected if the task was modified since."
                     }
                 },
                 "required": ["task_id"]
@@ -266,6 +393,10 @@ OPENAI_TOOLS = [
                     "completed": {
                         "type": "boolean",
                         "description": "New completion status."
+                    },
+                    "expected_version": {
+                        "type": "integer",
+                        "description": "Optional. The task's version as returned by list_tasks or search_tasks; the change is rejected if the task was modified since."
                     }
                 },
                 "required": ["task_id"]
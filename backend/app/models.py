@@ -1,7 +1,8 @@
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, List
-from datetime import datetime
-from pydantic import BaseModel, EmailStr
+from sqlalchemy import Index
+from typing import Optional, List, Literal
+from datetime import date, datetime
+from pydantic import BaseModel, EmailStr, model_validator
 
 
 # ============================================================================
@@ -17,6 +18,8 @@ class User(SQLModel, table=True):
     username: str = Field(max_length=100)
     hashed_password: str = Field(max_length=255)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Tokens carrying an older generation are rejected ("log out everywhere")
+    token_generation: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     
     # Relationships
     tasks: List["Task"] = Relationship(back_populates="user")
@@ -26,19 +29,54 @@ class User(SQLModel, table=True):
 class Task(SQLModel, table=True):
     """Task database model."""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Delta sync: WHERE user_id = ? AND updated_at > ?
+        Index("ix_tasks_user_id_updated_at", "user_id", "updated_at"),
+        # Completed-per-day statistics
+        Index("ix_tasks_user_id_completed_at", "user_id", "completed_at"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
     title: str = Field(max_length=255)
     description: Optional[str] = Field(default=None, max_length=1000)
     completed: bool = Field(default=False)
+    completed_at: Optional[datetime] = Field(default=None)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Bumped by every write; used for compare-and-swap updates (If-Match)
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
     
     # Relationship
     user: Optional[User] = Relationship(back_populates="tasks")
 
 
+class TaskCollection(SQLModel, table=True):
+    """Per-user task collection state (bumped by every task write)."""
+    __tablename__ = "task_collections"
+    
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    version: int = Field(default=0)
+    # Maintained incrementally; NULL means unknown and is recounted on read
+    total_count: Optional[int] = Field(default=None)
+    completed_count: Optional[int] = Field(default=None)
+
+
+class DeletedTask(SQLModel, table=True):
+    """Tombstone for a deleted task, kept so clients can delta-sync deletions."""
+    __tablename__ = "deleted_tasks"
+    __table_args__ = (
+        Index("ix_deleted_tasks_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    task_id: int
+    deleted_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
 # ============================================================================
 # Request/Response Models (Pydantic)
 # ============================================================================
@@ -64,6 +102,19 @@ class Token(BaseModel):
     username: str
 
 
+class StreamToken(BaseModel):
+    """Short-lived token for opening a task event stream from a browser."""
+    token: str
+    expires_in: int  # Seconds
+
+
+class Principal(BaseModel):
+    """Authenticated user as described by token claims (stateless auth mode)."""
+    id: int
+    username: str = ""
+    token_generation: int = 0
+
+
 class TaskCreate(BaseModel):
     """Task creation request."""
     title: str
@@ -86,11 +137,100 @@ class TaskResponse(BaseModel):
     completed: bool
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
         from_attributes = True
 
 
+class TaskPage(BaseModel):
+    """Paginated task list response."""
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None
+
+
+class TaskSearchHit(TaskResponse):
+    """Task matched by a full-text search."""
+    score: float
+
+
+class TaskSearchPage(BaseModel):
+    """Ranked, paginated search results."""
+    items: List[TaskSearchHit]
+    next_offset: Optional[int] = None
+
+
+class DailyTaskCount(BaseModel):
+    """Tasks created and completed on one day (UTC)."""
+    day: date
+    created: int
+    completed: int
+
+
+class TaskStats(BaseModel):
+    """Aggregated task statistics."""
+    total: int
+    completed: int
+    pending: int
+    start: Optional[date] = None
+    end: Optional[date] = None
+    daily: List[DailyTaskCount] = []
+
+
+class TaskChanges(BaseModel):
+    """Delta sync response: apply `deleted` first, then upsert `changed`."""
+    changed: List[TaskResponse]
+    deleted: List[int]
+    next_token: str
+    version: int  # Collection version the response is complete up to
+    reset: bool = False
+
+
+class TaskImportRow(BaseModel):
+    """One task read from an NDJSON/CSV import file."""
+    title: str = Field(min_length=1, max_length=255)
+    description: Optional[str] = Field(default=None, max_length=1000)
+    completed: bool = False
+
+
+class TaskOperation(BaseModel):
+    """Single operation inside a batch task mutation."""
+    op: Literal["create", "update", "delete", "toggle"]
+    task_id: Optional[int] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    completed: Optional[bool] = None
+    expected_version: Optional[int] = None
+    
+    @model_validator(mode="after")
+    def check_required_fields(self) -> "TaskOperation":
+        if self.op == "create" and not self.title:
+            raise ValueError("create operations require a title")
+        if self.op != "create" and self.task_id is None:
+            raise ValueError(f"{self.op} operations require a task_id")
+        return self
+
+
+class TaskBatchRequest(BaseModel):
+    """Batch task mutation request."""
+    operations: List[TaskOperation]
+
+
+class TaskOperationResult(BaseModel):
+    """Outcome of a single batch operation."""
+    index: int
+    op: str
+    success: bool
+    # State after the whole batch, not after this operation (None once deleted)
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    """Batch task mutation response (one result per operation, in order)."""
+    results: List[TaskOperationResult]
+
+
 # ============================================================================
 # Chat Models (Phase III)
 # ============================================================================
@@ -103,6 +243,9 @@ class Conversation(SQLModel, table=True):
     user_id: int = Field(foreign_key="users.id", index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Rolling summary of older turns and the last message folded into it
+    summary: Optional[str] = Field(default=None, max_length=5000)
+    summary_message_id: Optional[int] = Field(default=None)
     
     # Relationships
     user: Optional[User] = Relationship(back_populates="conversations")
@@ -112,6 +255,10 @@ class Conversation(SQLModel, table=True):
 class Message(SQLModel, table=True):
     """Message database model."""
     __tablename__ = "messages"
+    __table_args__ = (
+        # Recent history: WHERE conversation_id = ? AND id > ? ORDER BY id DESC
+        Index("ix_messages_conversation_id_id", "conversation_id", "id"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     conversation_id: int = Field(foreign_key="conversations.id", index=True)
@@ -139,6 +286,7 @@ class ToolCallInfo(BaseModel):
     tool_name: str
     inputs: dict
     output: dict
+    duration_ms: Optional[float] = None  # Execution time of the tool
 
 
 class ChatResponse(BaseModel):
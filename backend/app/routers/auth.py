@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from datetime import timedelta
-from app.models import User, UserCreate, UserLogin, Token
-from app.database import get_session
-from app.auth import hash_password, verify_password, create_access_token
-from app.config import settings
+from typing import Union
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Principal, User, UserCreate, UserLogin, Token
+from app.database import get_async_session
+from app.auth import (
+    hash_password_async,
+    verify_and_update_password,
+    create_user_token,
+    get_current_user,
+    revoke_user_tokens,
+)
 
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -13,7 +19,7 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 @router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def signup(
     user_data: UserCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Register a new user.
@@ -26,11 +32,11 @@ async def signup(
         JWT token and user information
         
     Raises:
-        HTTPException: If email already exists
+        HTTPException: If email already exists, or 429 if password hashing is saturated
     """
     # Check if user already exists
     statement = select(User).where(User.email == user_data.email)
-    existing_user = session.exec(statement).first()
+    existing_user = (await session.exec(statement)).first()
     
     if existing_user:
         raise HTTPException(
@@ -39,7 +45,7 @@ async def signup(
         )
     
     # Create new user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     new_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -47,15 +53,11 @@ async def signup(
     )
     
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
+    await session.refresh(new_user)
     
     # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(new_user.id)},
-        expires_delta=access_token_expires
-    )
+    access_token = create_user_token(new_user)
     
     return Token(
         access_token=access_token,
@@ -67,7 +69,7 @@ async def signup(
 @router.post("/login", response_model=Token)
 async def login(
     credentials: UserLogin,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Authenticate user and return JWT token.
@@ -80,28 +82,53 @@ async def login(
         JWT token and user information
         
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid, or 429 if password hashing is saturated
     """
     # Find user by email
     statement = select(User).where(User.email == credentials.email)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
+    
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await verify_and_update_password(credentials.password, user.hashed_password)
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Stored hash uses an outdated work factor: replace it while we have the password
+    if new_hash:
+        user.hashed_password = new_hash
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+    
     # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
-    )
+    access_token = create_user_token(user)
     
     return Token(
         access_token=access_token,
         user_id=user.id,
         username=user.username
     )
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_tokens(
+    current_user: Union[User, Principal] = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Revoke every access token issued to the current user (sign out everywhere).
+    
+    Other workers pick up the revocation on their next revocation-list refresh.
+    
+    Args:
+        current_user: Authenticated user
+        session: Database session
+    """
+    await revoke_user_tokens(session, current_user.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
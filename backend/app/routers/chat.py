@@ -4,10 +4,15 @@ Chat Router - Phase III AI-Powered Todo Chatbot (OpenRouter/OpenAI Version)
 Handles chat endpoint with OpenRouter (OpenAI compatible) integration and MCP tools.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+import asyncio
 import json
+import time
+import traceback
 from datetime import datetime
 from openai import AsyncOpenAI
 import os
@@ -16,15 +21,25 @@ from app.models import (
     User, Conversation, Message,
     ChatRequest, ChatResponse, ToolCallInfo
 )
-from app.database import get_session
+from app.chat_context import (
+    build_context, finish_history, fold_history, history_entry, start_history
+)
+from app.chat_reply_cache import lookup_reply, store_reply
+from app.chat_synthesis import reply_synthesis
+from app.database import async_engine, get_async_session
+from app.events import sse_message
+from app.server_timing import add_timing
+from app.intents import Intent, intent_reply, intent_stats, recognize_intent
 from app.auth import get_current_user, verify_user_access
 from app.config import get_settings
 from app.mcp_tools import (
-    OPENAI_TOOLS, 
-    add_task, list_tasks, complete_task, delete_task, update_task
+    OPENAI_TOOLS, READ_ONLY_TOOLS, WRITE_TOOLS, MCPToolResult,
+    add_task, list_tasks, search_tasks, get_task_stats,
+    complete_task, delete_task, update_task
 )
+from app.task_changes import commit_task_changes
 
-from app.context import session_context, user_id_context
+from app.context import session_context, unit_of_work_context, user_id_context
 
 router = APIRouter(prefix="/api", tags=["Chat"])
 
@@ -32,6 +47,8 @@ router = APIRouter(prefix="/api", tags=["Chat"])
 AVAILABLE_TOOLS = {
     "add_task": add_task,
     "list_tasks": list_tasks,
+    "search_tasks": search_tasks,
+    "get_task_stats": get_task_stats,
     "complete_task": complete_task,
     "delete_task": delete_task,
     "update_task": update_task
@@ -40,7 +57,7 @@ AVAILABLE_TOOLS = {
 # System prompt for the AI assistant
 SYSTEM_PROMPT = """You are a helpful task management assistant. You help users manage their todo tasks through natural conversation.
 
-You have access to tools for adding, listing, completing, deleting, and updating tasks.
+You have access to tools for adding, listing, searching, completing, deleting, and updating tasks.
 
 Guidelines:
 - Be friendly, concise, and action-oriented
@@ -50,37 +67,249 @@ Guidelines:
 - Use emojis sparingly (✅ for success, 🗑️ for delete, ✏️ for edit)
 - If me (the user) asks you to create/delete/update a task, use the appropriate tool.
 - When showing tasks, present them in a clear, numbered list
+- To find specific tasks by name or topic, use search_tasks instead of listing everything
+- To answer "how many" questions, use get_task_stats instead of listing everything
 - If the tool execution was successful, just confirm it based on the tool output, don't repeat the technical details unless asked.
 
 Current Date/Time: {current_time}
 """
 
-def get_openai_client():
-    """Configure and return OpenAI client instance pointing to OpenRouter."""
-    settings = get_settings()
+# Tool call ID reported for commands run by the intent fast path
+INTENT_TOOL_CALL_ID = "intent"
+
+def get_openai_client(request: Request) -> Optional[AsyncOpenAI]:
+    """
+    Return the shared OpenAI client created in the application lifespan.
     
-    # Priority: OPENROUTER_API_KEY -> OPEN_ROUTER -> GEMINI_API_KEY
-    api_key = settings.OPENROUTER_API_KEY or settings.OPEN_ROUTER or settings.GEMINI_API_KEY
-    # Priority: OPENROUTER_BASE_URL -> BASE_URL -> Default
-    base_url = settings.OPENROUTER_BASE_URL or settings.BASE_URL or "https://openrouter.ai/api/v1"
+    None when no AI API key is configured: turns answered without the model
+    (intent fast path, reply cache) still work, and the others fail in
+    `require_openai_client`.
+    """
+    return getattr(request.app.state, "openai_client", None)
+
+
+def require_openai_client(client: Optional[AsyncOpenAI]) -> AsyncOpenAI:
+    """
+    Return `client` for a turn that needs the model.
     
-    if not api_key:
+    Raises:
+        HTTPException: If no AI API key is configured
+    """
+    if client is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="AI API key not configured (OPENROUTER_API_KEY or OPEN_ROUTER)"
         )
+    return client
+
+
+async def start_turn(
+    session: AsyncSession,
+    user_id: int,
+    request: ChatRequest
+) -> Tuple[Conversation, List[Dict[str, Any]], bool]:
+    """
+    Get or create the conversation, save the user message and build the
+    message list for the model.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the conversation
+        request: Chat request
+        
+    Returns:
+        (conversation, messages for OpenAI, whether older history should be
+        folded into the conversation summary)
+        
+    Raises:
+        HTTPException: If the conversation does not exist or belongs to someone else
+    """
+    # 1. Get or create conversation
+    if request.conversation_id:
+        conversation = await session.get(Conversation, request.conversation_id)
+        if not conversation or conversation.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+    else:
+        conversation = Conversation(user_id=user_id)
+        session.add(conversation)
+        await session.commit()
+        await session.refresh(conversation)
+    
+    # 2. Save user message
+    user_message_db = Message(
+        conversation_id=conversation.id,
+        role="user",
+        content=request.message
+    )
+    session.add(user_message_db)
+    await session.flush()
+    if request.conversation_id:
+        # Reuses this worker's cached history unless the conversation changed elsewhere
+        history = await start_history(session, conversation, user_message_db)
+    else:
+        history = [history_entry(user_message_db)]
+    await session.commit()
+    
+    # 3. Build history for OpenAI: rolling summary plus recent turns within the token budget
+    messages, overflow = await build_context(
+        session, conversation, SYSTEM_PROMPT.format(current_time=datetime.now().isoformat()), history
+    )
+    
+    return conversation, messages, overflow
+
+
+async def run_tool_call(function_name: str, arguments: str) -> Dict[str, Any]:
+    """
+    Execute one tool call requested by the model.
+    
+    Args:
+        function_name: Name of the tool (must be in AVAILABLE_TOOLS)
+        arguments: JSON-encoded tool arguments
+        
+    Returns:
+        Tool call info: name, inputs, output and duration
+    """
+    started = time.perf_counter()
+    function_args: Dict[str, Any] = {}
+    try:
+        function_args = json.loads(arguments) if arguments else {}
+        # Execute tool
+        tool_result = await AVAILABLE_TOOLS[function_name](**function_args)
+        output = tool_result.to_dict()
+    except (ValueError, TypeError) as e:
+        # Malformed arguments from the model
+        output = MCPToolResult(success=False, error=f"Invalid arguments: {e}").to_dict()
+    
+    duration = time.perf_counter() - started
+    add_timing("tool", duration)
+    return {
+        "tool_name": function_name,
+        "inputs": function_args,
+        "output": output,
+        "duration_ms": round(duration * 1000, 2)
+    }
+
+
+async def run_tool_calls(
+    session: AsyncSession,
+    calls: List[Tuple[str, str, str]]
+) -> List[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    Execute a turn's tool calls as one unit of work.
+    
+    When every call is read-only, the calls run concurrently, each on its
+    own session. Otherwise all calls run one at a time on the turn's
+    session, in the model's order, so a read sees the writes requested
+    before it. Writes only flush: their changes are committed together once
+    every call has finished, or rolled back together if any write failed.
+    
+    Args:
+        session: The turn's database session (set as `session_context`)
+        calls: (tool call ID, function name, JSON arguments) in the model's order
+        
+    Returns:
+        (tool call info or None for an unknown tool, tool message for the
+        conversation) per call, in the same order
+    """
+    async def run_read(function_name: str, arguments: str) -> Optional[Dict[str, Any]]:
+        if function_name not in AVAILABLE_TOOLS:
+            return None
+        # Each gathered call runs in its own task and context copy
+        async with AsyncSession(async_engine, expire_on_commit=False) as read_session:
+            session_context.set(read_session)
+            return await run_tool_call(function_name, arguments)
+    
+    read_only = all(name in READ_ONLY_TOOLS or name not in AVAILABLE_TOOLS for _, name, _ in calls)
+    token_unit_of_work = unit_of_work_context.set(True)
+    try:
+        if read_only and len(calls) > 1:
+            infos = await asyncio.gather(*(run_read(name, arguments) for _, name, arguments in calls))
+        else:
+            infos = [
+                await run_tool_call(name, arguments) if name in AVAILABLE_TOOLS else None
+                for _, name, arguments in calls
+            ]
+    finally:
+        unit_of_work_context.reset(token_unit_of_work)
+    
+    writes = [info for info in infos if info and info["tool_name"] in WRITE_TOOLS]
+    if any(not info["output"]["success"] for info in writes):
+        await session.rollback()
+        for info in writes:
+            if info["output"]["success"]:
+                info["output"] = MCPToolResult(
+                    success=False,
+                    error="Rolled back because another change in this request failed"
+                ).to_dict()
+    elif any(info and info["tool_name"] not in READ_ONLY_TOOLS for info in infos):
+        # Also persists a counter recount done by get_task_stats
+        await commit_task_changes(session)
+    
+    results = []
+    for (tool_call_id, function_name, _), info in zip(calls, infos):
+        output = info["output"] if info else {"error": f"Tool {function_name} not found"}
+        results.append((info, {
+            "tool_call_id": tool_call_id,
+            "role": "tool",
+            "name": function_name,
+            "content": json.dumps(output)
+        }))
+    return results
+
+
+async def run_intent(session: AsyncSession, intent: Intent) -> Dict[str, Any]:
+    """
+    Run a recognized command's tool directly, without the model.
+    
+    Args:
+        session: The turn's database session
+        intent: Command recognized by `parse_intent`
         
-    return AsyncOpenAI(
-        api_key=api_key,
-        base_url=base_url
+    Returns:
+        Tool call info for the command's single tool call
+    """
+    started = time.perf_counter()
+    results = await run_tool_calls(
+        session, [(INTENT_TOOL_CALL_ID, intent.tool_name, json.dumps(intent.arguments))]
+    )
+    intent_stats.record_fast_path(started)
+    return results[0][0]
+
+
+async def save_assistant_message(
+    session: AsyncSession,
+    conversation_id: int,
+    stamp: datetime,
+    content: Optional[str],
+    tool_calls_info_list: List[Dict[str, Any]]
+) -> Message:
+    """
+    Persist the assistant's reply together with the tools it used.
+    
+    `stamp` is the conversation's `updated_at` as of the start of the turn;
+    it decides whether the reply can be appended to the cached history.
+    """
+    assistant_msg = Message(
+        conversation_id=conversation_id,
+        role="assistant",
+        content=content,
+        tool_calls=json.dumps(tool_calls_info_list) if tool_calls_info_list else None
     )
+    session.add(assistant_msg)
+    await session.flush()
+    await finish_history(session, conversation_id, stamp, assistant_msg)
+    await session.commit()
+    return assistant_msg
+
 
 @router.post("/{user_id}/chat", response_model=ChatResponse)
 async def chat(
     user_id: int,
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session),
+    client: Optional[AsyncOpenAI] = Depends(get_openai_client)
 ):
     """
     Chat endpoint for AI-powered task management using OpenRouter/OpenAI.
@@ -93,131 +322,96 @@ async def chat(
     
     try:
         settings = get_settings()
-        client = get_openai_client()
         model_name = settings.OPENROUTER_MODEL
 
-        # 1. Get or create conversation
-        if request.conversation_id:
-            conversation = session.get(Conversation, request.conversation_id)
-            if not conversation or conversation.user_id != user_id:
-                raise HTTPException(status_code=404, detail="Conversation not found")
-            conversation.updated_at = datetime.utcnow()
-        else:
-            conversation = Conversation(user_id=user_id)
-            session.add(conversation)
-            session.commit()
-            session.refresh(conversation)
-        
-        # 2. Save user message
-        user_message_db = Message(
-            conversation_id=conversation.id,
-            role="user",
-            content=request.message
-        )
-        session.add(user_message_db)
-        session.commit()
-        
-        # 3. Build history for OpenAI
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT.format(current_time=datetime.now().isoformat())}
-        ]
-        
-        # Fetch recent history
-        statement = select(Message).where(Message.conversation_id == conversation.id).order_by(Message.created_at)
-        history_msgs = session.exec(statement).all()
-        
-        for msg in history_msgs:
-            # We map DB roles to OpenAI roles. 
-            # Note: We skip complex tool call history reconstruction for simplicity 
-            # and just provide the text content to keep context.
-            if msg.content:
-                msg_role = "user" if msg.role == "user" else "assistant"
-                messages.append({"role": msg_role, "content": msg.content})
-
-        # 4. First Call to LLM
-        response = await client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            tools=OPENAI_TOOLS,
-            tool_choice="auto"
-        )
-        
-        response_message = response.choices[0].message
-        tool_calls = response_message.tool_calls
-        
-        final_content = response_message.content
-        tool_calls_info_list = []
+        conversation, messages, overflow = await start_turn(session, user_id, request)
+        # Read now: a rolled-back tool transaction expires the loaded objects
+        conversation_id, stamp = conversation.id, conversation.updated_at
 
-        # 5. Handle Tool Calls
-        if tool_calls:
-            # Append the assistant's message (with tool calls) to history
-            messages.append(response_message)
+        # 4. Literal commands ("delete task 7") are run without the model
+        intent = recognize_intent(request.message)
+        reply_key, cached = (None, None) if intent else await lookup_reply(
+            session, user_id, conversation_id, model_name, request.message
+        )
+        if intent is not None:
+            info = await run_intent(session, intent)
+            final_content = intent_reply(intent, info["output"])
+            tool_calls_info_list = [info]
+        elif cached is not None:
+            # Same read-only question while the user's tasks are unchanged
+            final_content, tool_calls_info_list = cached["response"], cached["tool_calls"]
+        else:
+            # 5. First Call to LLM
+            client = require_openai_client(client)
+            response = await client.chat.completions.create(
+                model=model_name,
+                messages=messages,
+                tools=OPENAI_TOOLS,
+                tool_choice="auto"
+            )
             
-            # Execute each tool
-            for tool_call in tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-                
-                function_to_call = AVAILABLE_TOOLS.get(function_name)
+            response_message = response.choices[0].message
+            tool_calls = response_message.tool_calls
+            
+            final_content = response_message.content
+            tool_calls_info_list = []
+
+            # 6. Handle Tool Calls
+            if tool_calls:
+                # Append the assistant's message (with tool calls) to history
+                messages.append(response_message)
                 
-                if function_to_call:
-                    # Execute tool
-                    tool_result = function_to_call(**function_args)
-                    
-                    # Store info for response
-                    tool_calls_info_list.append({
-                        "tool_name": function_name,
-                        "inputs": function_args,
-                        "output": tool_result.to_dict()
-                    })
+                # Execute the tools: reads concurrently, writes committed together
+                results = await run_tool_calls(session, [
+                    (tool_call.id, tool_call.function.name, tool_call.function.arguments)
+                    for tool_call in tool_calls
+                ])
+                for info, tool_message in results:
+                    if info:
+                        # Store info for response
+                        tool_calls_info_list.append(info)
                     
                     # Add tool result to messages
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": json.dumps(tool_result.to_dict())
-                    })
-                else:
-                    # Handle unknown tool?
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": json.dumps({"error": f"Tool {function_name} not found"})
-                    })
+                    messages.append(tool_message)
 
-            # 6. Second Call to LLM (Get final response after tools)
-            second_response = await client.chat.completions.create(
-                model=model_name,
-                messages=messages
-            )
-            final_content = second_response.choices[0].message.content
-
-        # 7. Save assistant message
-        assistant_msg = Message(
-            conversation_id=conversation.id,
-            role="assistant",
-            content=final_content,
-            tool_calls=json.dumps(tool_calls_info_list) if tool_calls_info_list else None
+                # 7. Reply from a template, or make a second call to the LLM
+                final_content = reply_synthesis.template_reply([info for info, _ in results])
+                if final_content is None:
+                    started = time.perf_counter()
+                    second_response = await client.chat.completions.create(
+                        model=model_name,
+                        messages=messages
+                    )
+                    final_content = second_response.choices[0].message.content
+                    reply_synthesis.record_model_reply(started)
+            
+            await store_reply(reply_key, final_content, tool_calls_info_list)
+
+        # 8. Save assistant message
+        await save_assistant_message(
+            session, conversation_id, stamp, final_content, tool_calls_info_list
         )
-        session.add(assistant_msg)
-        session.commit()
+        
+        # 9. Summarize older history once the response is sent
+        if overflow and settings.CHAT_SUMMARY_ENABLED and client is not None:
+            background_tasks.add_task(fold_history, client, conversation_id)
         
         return ChatResponse(
-            conversation_id=conversation.id,
+            conversation_id=conversation_id,
             response=final_content or "",
             tool_calls=[
                 ToolCallInfo(
                     tool_name=tc["tool_name"],
                     inputs=tc["inputs"],
-                    output=tc["output"]
+                    output=tc["output"],
+                    duration_ms=tc["duration_ms"]
                 ) for tc in tool_calls_info_list
             ]
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -227,3 +421,203 @@ async def chat(
         # Reset context variables
         session_context.reset(token_session)
         user_id_context.reset(token_user_id)
+
+
+async def stream_completion(
+    client: AsyncOpenAI,
+    content_parts: List[str],
+    tool_calls: Dict[int, Dict[str, str]],
+    **params: Any
+) -> AsyncIterator[str]:
+    """
+    Stream one completion, yielding a `token` SSE message per content delta.
+    
+    Content is collected into `content_parts`; tool call fragments, which
+    arrive spread over several chunks, are merged into `tool_calls` by index.
+    """
+    stream = await client.chat.completions.create(stream=True, **params)
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content_parts.append(delta.content)
+            yield sse_message("token", {"content": delta.content})
+        for fragment in delta.tool_calls or ():
+            call = tool_calls.setdefault(fragment.index, {"id": "", "name": "", "arguments": ""})
+            if fragment.id:
+                call["id"] = fragment.id
+            if fragment.function:
+                call["name"] += fragment.function.name or ""
+                call["arguments"] += fragment.function.arguments or ""
+
+
+async def chat_event_stream(
+    client: Optional[AsyncOpenAI],
+    user_id: int,
+    conversation_id: int,
+    stamp: datetime,
+    messages: List[Dict[str, Any]],
+    prompt: str,
+    intent: Optional[Intent] = None
+) -> AsyncIterator[str]:
+    """
+    Run a chat turn, relaying its progress as SSE messages.
+    
+    Owns its own session because the body is produced after request
+    dependencies close. A recognized command (`intent`) is run without the
+    model, and a cached reply to the same read-only `prompt` in this
+    conversation is sent as is. The assistant message is saved once the
+    turn completes; a failed or abandoned turn leaves only the user message.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        # Set context variables for tools to access
+        token_session = session_context.set(session)
+        token_user_id = user_id_context.set(user_id)
+        
+        try:
+            model_name = get_settings().OPENROUTER_MODEL
+            yield sse_message("conversation", {"conversation_id": conversation_id})
+            reply_key, cached = (None, None) if intent else await lookup_reply(
+                session, user_id, conversation_id, model_name, prompt
+            )
+            
+            if intent is not None:
+                yield sse_message("tool_start", {"id": INTENT_TOOL_CALL_ID, "tool_name": intent.tool_name})
+                info = await run_intent(session, intent)
+                yield sse_message("tool_end", {"id": INTENT_TOOL_CALL_ID, **info})
+                content_parts = [intent_reply(intent, info["output"])]
+                tool_calls_info_list = [info]
+                yield sse_message("token", {"content": content_parts[0]})
+            elif cached is not None:
+                content_parts = [cached["response"]]
+                tool_calls_info_list = cached["tool_calls"]
+                yield sse_message("token", {"content": content_parts[0]})
+            else:
+                # First call: stream the reply, collecting any tool calls
+                client = require_openai_client(client)
+                content_parts: List[str] = []
+                tool_calls: Dict[int, Dict[str, str]] = {}
+                async for message in stream_completion(
+                    client, content_parts, tool_calls,
+                    model=model_name, messages=messages, tools=OPENAI_TOOLS, tool_choice="auto"
+                ):
+                    yield message
+                
+                tool_calls_info_list = []
+                if tool_calls:
+                    calls = [tool_calls[index] for index in sorted(tool_calls)]
+                    messages.append({
+                        "role": "assistant",
+                        "content": "".join(content_parts) or None,
+                        "tool_calls": [
+                            {
+                                "id": call["id"],
+                                "type": "function",
+                                "function": {"name": call["name"], "arguments": call["arguments"]}
+                            } for call in calls
+                        ]
+                    })
+                    
+                    for call in calls:
+                        yield sse_message("tool_start", {"id": call["id"], "tool_name": call["name"]})
+                    
+                    # Reads run concurrently; writes are committed together
+                    results = await run_tool_calls(
+                        session, [(call["id"], call["name"], call["arguments"]) for call in calls]
+                    )
+                    for call, (info, tool_message) in zip(calls, results):
+                        messages.append(tool_message)
+                        if info:
+                            tool_calls_info_list.append(info)
+                        yield sse_message("tool_end", {
+                            "id": call["id"],
+                            "tool_name": call["name"],
+                            "inputs": info["inputs"] if info else {},
+                            "output": info["output"] if info else json.loads(tool_message["content"]),
+                            "duration_ms": info["duration_ms"] if info else None
+                        })
+                    
+                    reply = reply_synthesis.template_reply([info for info, _ in results])
+                    if reply is not None:
+                        content_parts = [reply]
+                        yield sse_message("token", {"content": reply})
+                    else:
+                        # Second call: stream the answer based on the tool results
+                        content_parts = []
+                        started = time.perf_counter()
+                        async for message in stream_completion(
+                            client, content_parts, {}, model=model_name, messages=messages
+                        ):
+                            yield message
+                        reply_synthesis.record_model_reply(started)
+                
+                await store_reply(reply_key, "".join(content_parts), tool_calls_info_list)
+            
+            final_content = "".join(content_parts)
+            assistant_msg = await save_assistant_message(
+                session, conversation_id, stamp, final_content, tool_calls_info_list
+            )
+            
+            yield sse_message("done", {
+                "conversation_id": conversation_id,
+                "message_id": assistant_msg.id,
+                "response": final_content,
+                "tool_calls": tool_calls_info_list
+            })
+        
+        except HTTPException as e:
+            yield sse_message("error", {"detail": e.detail})
+        except Exception as e:
+            traceback.print_exc()
+            yield sse_message("error", {"detail": f"Chat error: {str(e)}"})
+        finally:
+            # Reset context variables
+            session_context.reset(token_session)
+            user_id_context.reset(token_user_id)
+
+
+@router.post("/{user_id}/chat/stream")
+async def chat_stream(
+    user_id: int,
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    client: Optional[AsyncOpenAI] = Depends(get_openai_client)
+):
+    """
+    Streaming variant of the chat endpoint (Server-Sent Events).
+    
+    Sends a `conversation` message with the conversation ID, `token`
+    messages as the reply is generated, `tool_start`/`tool_end` around each
+    tool call, and finally `done` with the full response (or `error`).
+    
+    Args:
+        user_id: User ID from path
+        request: Chat request
+        current_user: Current authenticated user
+        session: Database session
+        client: Shared OpenAI client (None without an AI API key)
+        
+    Returns:
+        text/event-stream response
+        
+    Raises:
+        HTTPException: If the conversation is not found
+    """
+    verify_user_access(current_user, user_id)
+    
+    conversation, messages, overflow = await start_turn(session, user_id, request)
+    intent = recognize_intent(request.message)
+    
+    # Summarize older history once the stream has finished
+    background = None
+    if overflow and get_settings().CHAT_SUMMARY_ENABLED and client is not None:
+        background = BackgroundTask(fold_history, client, conversation.id)
+    
+    return StreamingResponse(
+        chat_event_stream(client, user_id, conversation.id, conversation.updated_at, messages, request.message, intent),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=background
+    )
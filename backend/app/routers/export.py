@@ -0,0 +1,153 @@
+"""
+Export Router - streaming data export for backups and compliance requests.
+
+Rows are read through server-side cursors and written to the response one at
+a time, so memory use stays constant regardless of how much data a user has.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Any, AsyncIterator, Dict, List
+from datetime import datetime
+import csv
+import io
+import json
+
+from app.models import Conversation, Message, Task, User
+from app.database import async_engine
+from app.auth import get_current_user, verify_user_access
+from app.config import settings
+
+
+router = APIRouter(prefix="/api", tags=["Export"])
+
+RESOURCES = ("tasks", "conversations", "messages")
+
+
+def export_statement(resource: str, user_id: int):
+    """
+    Build the column-level SELECT for one resource.
+
+    Plain table columns are selected instead of ORM entities so rows are
+    never added to a session's identity map.
+    """
+    if resource == "tasks":
+        return (
+            select(Task.__table__)
+            .where(Task.user_id == user_id)
+            .order_by(Task.id)
+        )
+    if resource == "conversations":
+        return (
+            select(Conversation.__table__)
+            .where(Conversation.user_id == user_id)
+            .order_by(Conversation.id)
+        )
+    return (
+        select(Message.__table__)
+        .join(Conversation, Conversation.id == Message.conversation_id)
+        .where(Conversation.user_id == user_id)
+        .order_by(Message.id)
+    )
+
+
+def export_columns(resource: str) -> List[str]:
+    """Column names of a resource, in table order."""
+    model = {"tasks": Task, "conversations": Conversation, "messages": Message}[resource]
+    return [column.name for column in model.__table__.columns]
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert a column value into something JSON/CSV friendly."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def stream_rows(resource: str, user_id: int) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield a resource's rows as dicts using a server-side cursor.
+
+    The session is owned by the generator because the response body is
+    produced after the request's dependencies have been torn down.
+    """
+    statement = export_statement(resource, user_id).execution_options(
+        yield_per=settings.EXPORT_BATCH_SIZE
+    )
+    async with AsyncSession(async_engine) as session:
+        result = await session.stream(statement)
+        async for row in result.mappings():
+            yield {key: to_json_value(value) for key, value in row.items()}
+
+
+async def ndjson_lines(resources: List[str], user_id: int) -> AsyncIterator[str]:
+    """One JSON object per line, tagged with its resource type."""
+    for resource in resources:
+        record_type = resource[:-1]  # tasks -> task
+        async for row in stream_rows(resource, user_id):
+            yield json.dumps({"type": record_type, **row}, ensure_ascii=False) + "\n"
+
+
+async def csv_lines(resource: str, user_id: int) -> AsyncIterator[str]:
+    """Header row followed by one CSV row per record."""
+    columns = export_columns(resource)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for row in stream_rows(resource, user_id):
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+@router.get("/{user_id}/export")
+async def export_data(
+    user_id: int,
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    resource: str = Query(default="all", pattern="^(all|tasks|conversations|messages)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream a user's tasks, conversations and messages as NDJSON or CSV.
+
+    Args:
+        user_id: User ID from path
+        format: `ndjson` (one object per line, with a `type` field) or `csv`
+        resource: Which rows to export; CSV needs a single resource
+        current_user: Current authenticated user
+
+    Returns:
+        Streaming response with the exported rows
+
+    Raises:
+        HTTPException: If CSV is requested for more than one resource
+    """
+    verify_user_access(current_user, user_id)
+
+    resources = list(RESOURCES) if resource == "all" else [resource]
+    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+
+    if format == "csv":
+        if len(resources) != 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV export needs a single resource (tasks, conversations or messages)"
+            )
+        body = csv_lines(resource, user_id)
+        media_type = "text/csv"
+    else:
+        body = ndjson_lines(resources, user_id)
+        media_type = "application/x-ndjson"
+
+    filename = f"export-{user_id}-{resource}-{stamp}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
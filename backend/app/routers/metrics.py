@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Request
+from app import events, llm
+from app.chat_context import history_cache
+from app.chat_reply_cache import reply_cache
+from app.chat_synthesis import reply_synthesis
+from app.intents import intent_stats
+from app.auth import password_hasher, principal_cache, revocations, token_cache
+from app.task_cache import task_cache
+
+
+router = APIRouter(prefix="/api", tags=["Metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics(request: Request):
+    """
+    Runtime counters for caches and other in-process components.
+    
+    Args:
+        request: Incoming request (for the shared AI client)
+    
+    Returns:
+        Counters grouped by component
+    """
+    return {
+        "task_cache": task_cache.stats(),
+        "task_events": events.task_events.stats(),
+        "auth": {
+            "tokens": token_cache.stats(),
+            "principals": principal_cache.stats(),
+            "revocations": revocations.stats(),
+            "password_hashing": password_hasher.stats()
+        },
+        "chat_history": history_cache.stats(),
+        "chat_replies": reply_synthesis.stats(),
+        "chat_reply_cache": reply_cache.stats(),
+        "chat_intents": intent_stats.stats(),
+        "llm_pool": llm.pool_stats(getattr(request.app.state, "openai_client", None))
+    }
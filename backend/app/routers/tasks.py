@@ -1,38 +1,286 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from typing import List
-from datetime import datetime
-from app.models import Task, TaskCreate, TaskUpdate, TaskResponse, User
-from app.database import get_session
-from app.auth import get_current_user, verify_user_access
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert
+from sqlmodel import and_, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from datetime import date, datetime, time, timedelta
+from collections import Counter
+from itertools import groupby
+import base64
+import binascii
+import io
+import json
+import orjson
+from app.models import (
+    Task, TaskCreate, TaskUpdate, TaskResponse, TaskPage, User, DeletedTask,
+    TaskBatchRequest, TaskBatchResponse, TaskOperation, TaskOperationResult, TaskChanges,
+    TaskSearchHit, TaskSearchPage, TaskStats, DailyTaskCount, StreamToken
+)
+from app import events
+from app.database import async_engine, get_async_session
+from app.auth import create_stream_token, get_current_user, get_stream_user, verify_user_access
+from app.config import settings
+from app.search import search_tasks as run_task_search
+from app.task_cache import serialize_task, task_cache
+from app.task_import import import_tasks
+from app.task_changes import (
+    TaskVersionConflict, commit_task_changes, delete_task_row, delete_task_rows,
+    get_task_counts, get_task_version, record_task_change, recount_tasks,
+    toggle_task_row, toggle_task_rows, tombstone_horizon, update_task_row,
+    update_task_rows
+)
 
 
 router = APIRouter(prefix="/api", tags=["Tasks"])
 
+# Task columns in TaskResponse field order, for the orjson fast path
+TASK_RESPONSE_COLUMNS = [getattr(Task, name) for name in TaskResponse.model_fields]
 
-@router.get("/{user_id}/tasks", response_model=List[TaskResponse])
+
+def encode_cursor(task: Task) -> str:
+    """
+    Build an opaque pagination cursor pointing just after a task.
+    
+    Args:
+        task: Last task of the current page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([task.created_at.isoformat(), task.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    
+    Args:
+        cursor: Cursor string from the client
+        
+    Returns:
+        Tuple of (created_at, id) of the last task already returned
+        
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def encode_sync_token(version: int, synced_at: datetime) -> str:
+    """Build an opaque delta-sync token from a collection version and timestamp."""
+    raw = json.dumps([version, synced_at.isoformat()]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[int, datetime]:
+    """
+    Decode a token produced by `encode_sync_token`.
+    
+    Raises:
+        HTTPException: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        version, synced_at = json.loads(base64.urlsafe_b64decode(padded))
+        return int(version), datetime.fromisoformat(synced_at)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token"
+        )
+
+
+def task_list_etag(user_id: int, version: int) -> str:
+    """Build the weak ETag for a user's task collection at a given version."""
+    return f'W/"tasks-{user_id}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison).
+    
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current ETag
+        
+    Returns:
+        True if the client's cached representation is still current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def task_etag(version: int) -> str:
+    """Build the strong ETag of a single task at a given version."""
+    return f'"{version}"'
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    Parse an If-Match header into the task version the client expects.
+    
+    Args:
+        if_match: Raw If-Match header value
+        
+    Returns:
+        Expected version, or None for an unconditional write
+        
+    Raises:
+        HTTPException: If the header is not a task ETag
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid If-Match header"
+        )
+
+
+def version_conflict(error: TaskVersionConflict) -> HTTPException:
+    """Build the 412 response for a failed compare-and-swap write."""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail=str(error),
+        headers={"ETag": task_etag(error.current_version)}
+    )
+
+
+def orjson_response(content: Any, headers: Dict[str, str]) -> Response:
+    """
+    Serialize a task payload with orjson, skipping response_model validation.
+    
+    For task rows (naive datetimes, no floats) the output is byte-identical
+    to FastAPI's JSONResponse.
+    
+    Args:
+        content: Dicts/lists of task fields in TaskResponse order
+        headers: Response headers
+        
+    Returns:
+        JSON response
+    """
+    return Response(content=orjson.dumps(content), media_type="application/json", headers=headers)
+
+
+@router.get("/{user_id}/tasks", response_model=Union[TaskPage, List[TaskResponse]])
 async def get_tasks(
     user_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(
+        default=settings.TASKS_PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.TASKS_PAGE_MAX_LIMIT
+    ),
+    cursor: Optional[str] = None,
+    all_tasks: bool = Query(
+        default=False,
+        alias="all",
+        description="Return every task as a plain list (unpaginated)"
+    ),
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Get all tasks for a user.
+    Get tasks for a user, newest first.
+    
+    Results are keyset-paginated on (created_at, id); pass the returned
+    `next_cursor` back as `cursor` to fetch the next page. `all=true` keeps
+    the legacy behaviour of returning the full list as a JSON array.
+    
+    The response carries an ETag derived from the user's task collection
+    version; a matching If-None-Match is answered with 304 before the task
+    query runs. The full list is served from the per-user task cache when
+    the cached copy was read at the current version.
     
     Args:
         user_id: User ID from path
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for ETag)
+        limit: Maximum number of tasks per page
+        cursor: Cursor from the previous page
+        all_tasks: Return the unpaginated list
         current_user: Current authenticated user
         session: Database session
         
     Returns:
-        List of user's tasks
+        A page of tasks, or the full list when `all` is set
     """
     verify_user_access(current_user, user_id)
     
-    statement = select(Task).where(Task.user_id == user_id).order_by(Task.created_at.desc())
-    tasks = session.exec(statement).all()
+    # One primary-key lookup; the cached list is only used if it was read at
+    # this version, so writes made by other workers are never hidden
+    version = await get_task_version(session, user_id)
+    
+    etag = task_list_etag(user_id, version)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    response.headers.update(cache_headers)
+    
+    # Fast path: plain column tuples serialized straight to JSON bytes
+    fast = settings.TASKS_FAST_JSON
+    statement = (
+        select(*TASK_RESPONSE_COLUMNS) if fast else select(Task)
+    ).where(Task.user_id == user_id).order_by(Task.created_at.desc(), Task.id.desc())
+    
+    if all_tasks:
+        cached = await task_cache.get_list(user_id, version)
+        if cached is not None:
+            return orjson_response(cached, cache_headers) if fast else cached
+        rows = (await session.exec(statement)).all()
+        if fast:
+            tasks = [row._asdict() for row in rows]
+            await task_cache.set_list(user_id, version, tasks)
+            return orjson_response(tasks, cache_headers)
+        tasks = [serialize_task(task) for task in rows]
+        await task_cache.set_list(user_id, version, tasks)
+        return tasks
+    
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        statement = statement.where(
+            or_(
+                Task.created_at < cursor_created_at,
+                and_(Task.created_at == cursor_created_at, Task.id < cursor_id)
+            )
+        )
+    
+    # Fetch one extra row to know whether another page exists
+    tasks = (await session.exec(statement.limit(limit + 1))).all()
+    has_more = len(tasks) > limit
+    tasks = tasks[:limit]
+    next_cursor = encode_cursor(tasks[-1]) if has_more else None
     
-    return tasks
+    if fast:
+        return orjson_response(
+            {"items": [row._asdict() for row in tasks], "next_cursor": next_cursor},
+            cache_headers
+        )
+    return TaskPage.model_validate(
+        {"items": tasks, "next_cursor": next_cursor},
+        from_attributes=True
+    )
 
 
 @router.post("/{user_id}/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -40,7 +288,7 @@ async def create_task(
     user_id: int,
     task_data: TaskCreate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Create a new task.
@@ -63,25 +311,510 @@ async def create_task(
     )
     
     session.add(new_task)
-    session.commit()
-    session.refresh(new_task)
+    await session.flush()
+    await record_task_change(session, user_id, task_ids=[new_task.id], total_delta=1)
+    await commit_task_changes(session)
+    await session.refresh(new_task)
     
     return new_task
 
 
+@router.post("/{user_id}/tasks/batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    user_id: int,
+    batch: TaskBatchRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Apply a mixed list of create/update/delete/toggle operations.
+    
+    Consecutive operations of the same kind are coalesced into a single
+    bulk INSERT/UPDATE/DELETE statement; an operation with an
+    `expected_version` instead runs the same compare-and-swap write as the
+    single-task endpoints. Versions are always bumped in SQL. The whole
+    batch is committed in one transaction. Operations on tasks the user does not own (or that an
+    earlier operation deleted), or whose `expected_version` is stale, are
+    reported as failed without aborting the rest of the batch.
+    
+    Args:
+        user_id: User ID from path
+        batch: Operations to apply, in order
+        current_user: Current authenticated user
+        session: Database session
+        
+    Returns:
+        One result per operation, in request order
+    """
+    verify_user_access(current_user, user_id)
+    
+    operations = batch.operations
+    if len(operations) > settings.TASKS_BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.TASKS_BATCH_MAX_OPERATIONS} operations"
+        )
+    
+    now = datetime.utcnow()
+    results: List[Optional[TaskOperationResult]] = [None] * len(operations)
+    touched_ids: Dict[int, int] = {}  # operation index -> task id
+    deleted_ids: List[int] = []
+    total_delta = 0
+    completed_delta = 0
+    
+    def fail(index: int, error: str = "Task not found") -> None:
+        results[index] = TaskOperationResult(
+            index=index, op=operations[index].op, success=False, error=error
+        )
+    
+    def succeed(index: int, task_id: int, delta: int) -> None:
+        nonlocal total_delta, completed_delta
+        completed_delta += delta
+        if operations[index].op == "delete":
+            total_delta -= 1
+            deleted_ids.append(task_id)
+        touched_ids[index] = task_id
+    
+    async def apply_single(kind: str, index: int, op: TaskOperation) -> None:
+        try:
+            if kind == "update":
+                changed = await update_task_row(
+                    session, user_id, op.task_id,
+                    op.model_dump(include={"title", "description"}, exclude_none=True),
+                    completed=op.completed,
+                    expected_version=op.expected_version
+                )
+                delta = changed[1] if changed else None
+            elif kind == "toggle":
+                changed = await toggle_task_row(session, user_id, op.task_id, op.expected_version)
+                delta = changed[1] if changed else None
+            else:
+                delta = await delete_task_row(session, user_id, op.task_id, op.expected_version)
+        except TaskVersionConflict as conflict:
+            fail(index, f"Version conflict: task is at version {conflict.current_version}")
+            return
+        if delta is None:
+            fail(index)
+        else:
+            succeed(index, op.task_id, delta)
+    
+    async def apply_bulk(kind: str, segment: List[Tuple[int, TaskOperation]]) -> None:
+        if not segment:
+            return
+        write_counts = Counter(op.task_id for _, op in segment)
+        if kind == "update":
+            # Several updates of one task apply in order, so later values win
+            changes: Dict[int, Dict[str, Any]] = {}
+            for _, op in segment:
+                changes.setdefault(op.task_id, {}).update(
+                    op.model_dump(include={"title", "description", "completed"}, exclude_none=True)
+                )
+            deltas = await update_task_rows(session, user_id, changes, write_counts)
+        elif kind == "toggle":
+            deltas = await toggle_task_rows(session, user_id, write_counts)
+        else:
+            deltas = await delete_task_rows(session, user_id, write_counts)
+        
+        seen = set()
+        for index, op in segment:
+            if op.task_id not in deltas or (kind == "delete" and op.task_id in seen):
+                fail(index)
+                continue
+            # The completed count changes once per task, not once per operation
+            succeed(index, op.task_id, 0 if op.task_id in seen else deltas[op.task_id])
+            seen.add(op.task_id)
+    
+    for kind, group in groupby(enumerate(operations), key=lambda item: item[1].op):
+        run = list(group)
+        
+        if kind == "create":
+            rows = [
+                {
+                    "user_id": user_id,
+                    "title": op.title,
+                    "description": op.description,
+                    "completed": bool(op.completed),
+                    "completed_at": now if op.completed else None,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for _, op in run
+            ]
+            statement = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+            created_ids = (await session.exec(statement, params=rows)).scalars().all()
+            for (index, _), task_id in zip(run, created_ids):
+                touched_ids[index] = task_id
+            total_delta += len(created_ids)
+            completed_delta += sum(1 for _, op in run if op.completed)
+            continue
+        
+        # Operations with an `expected_version` are compare-and-swap writes of
+        # their own; the runs between them are merged into one statement.
+        # Tasks deleted earlier in the batch (or owned by someone else) are
+        # simply not found.
+        segment: List[Tuple[int, TaskOperation]] = []
+        for index, op in run:
+            if op.expected_version is None:
+                segment.append((index, op))
+                continue
+            await apply_bulk(kind, segment)
+            segment = []
+            await apply_single(kind, index, op)
+        await apply_bulk(kind, segment)
+    
+    # Load the final state of every surviving task in one query
+    tasks_by_id = {}
+    surviving_ids = set(touched_ids.values()) - set(deleted_ids)
+    if surviving_ids:
+        statement = (
+            select(Task)
+            .where(Task.id.in_(surviving_ids))
+            .execution_options(populate_existing=True)
+        )
+        tasks_by_id = {task.id: task for task in (await session.exec(statement)).all()}
+    
+    if touched_ids:
+        await record_task_change(
+            session, user_id,
+            task_ids=surviving_ids,
+            deleted_ids=deleted_ids,
+            total_delta=total_delta,
+            completed_delta=completed_delta
+        )
+    await commit_task_changes(session)
+    
+    for index, task_id in touched_ids.items():
+        task = tasks_by_id.get(task_id)
+        results[index] = TaskOperationResult(
+            index=index,
+            op=operations[index].op,
+            success=True,
+            task=TaskResponse.model_validate(task) if task else None
+        )
+    
+    return TaskBatchResponse(results=results)
+
+
+@router.post("/{user_id}/tasks/import")
+async def import_task_file(
+    user_id: int,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(default=None, pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk-import tasks from an NDJSON or CSV upload.
+    
+    Each record needs a `title` and may have `description` and `completed`.
+    The file is parsed as a stream and inserted in batches; the response is
+    an NDJSON stream of `error`, `progress` and `done` events.
+    
+    Args:
+        user_id: User ID from path
+        file: Uploaded NDJSON or CSV file
+        format: File format; inferred from the file name/content type if omitted
+        current_user: Current authenticated user
+        
+    Returns:
+        Streaming NDJSON progress report
+    """
+    verify_user_access(current_user, user_id)
+    
+    if format is None:
+        filename = (file.filename or "").lower()
+        is_csv = filename.endswith(".csv") or file.content_type in ("text/csv", "application/csv")
+        format = "csv" if is_csv else "ndjson"
+    
+    # FastAPI closes uploaded files when the endpoint returns, before a
+    # streaming body is sent, so the import takes over the spooled file
+    source = file.file
+    file.file = io.BytesIO()
+    
+    return StreamingResponse(import_tasks(source, format, user_id), media_type="application/x-ndjson")
+
+
+async def task_event_stream(request: Request, user_id: int) -> AsyncIterator[str]:
+    """
+    Relay a user's task change events as SSE messages.
+    
+    Subscribes before reading the collection version so no write can fall
+    between the `ready` message and the first change event. Owns its own
+    session because the body is produced after request dependencies close.
+    """
+    async with events.task_events.subscribe(user_id) as subscription:
+        async with AsyncSession(async_engine) as session:
+            version = await get_task_version(session, user_id)
+        
+        yield "retry: 5000\n\n"
+        yield events.sse_message("ready", {"version": version}, event_id=version)
+        
+        while True:
+            event = await subscription.get(timeout=settings.TASK_EVENTS_HEARTBEAT_SECONDS)
+            if event is None:
+                if await request.is_disconnected():
+                    break
+                yield ": ping\n\n"
+            elif event["type"] == "resync":
+                yield events.sse_message("resync", {})
+            else:
+                yield events.sse_message("tasks", event, event_id=event["version"])
+
+
+@router.post("/{user_id}/tasks/events/token", response_model=StreamToken)
+async def create_task_events_token(
+    user_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Issue a short-lived token for opening the task event stream.
+    
+    EventSource cannot send an Authorization header, so browsers pass this
+    token as the `token` query parameter of `GET /tasks/events` instead of
+    their access token. It is valid for TASK_EVENTS_TOKEN_EXPIRE_SECONDS and
+    only on the event stream; fetch a new one before each (re)connect.
+    
+    Args:
+        user_id: User ID from path
+        current_user: Current authenticated user
+        
+    Returns:
+        Stream token and its lifetime in seconds
+    """
+    verify_user_access(current_user, user_id)
+    
+    return StreamToken(
+        token=create_stream_token(current_user),
+        expires_in=settings.TASK_EVENTS_TOKEN_EXPIRE_SECONDS
+    )
+
+
+@router.get("/{user_id}/tasks/events")
+async def stream_task_events(
+    user_id: int,
+    request: Request,
+    current_user: User = Depends(get_stream_user)
+):
+    """
+    Push channel for task changes (Server-Sent Events).
+    
+    Sends a `ready` message with the current collection version, then one
+    `tasks` message per committed write from any client (REST API, batch,
+    import or chatbot) with the new version and the changed/deleted task
+    IDs. A `resync` message means events were dropped and the client should
+    reload. Comment lines are sent as heartbeats.
+    
+    Args:
+        user_id: User ID from path
+        request: Incoming request (for disconnect detection)
+        current_user: Current authenticated user (access token header or stream token query parameter)
+        
+    Returns:
+        text/event-stream response
+    """
+    verify_user_access(current_user, user_id)
+    
+    return StreamingResponse(
+        task_event_stream(request, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{user_id}/tasks/changes", response_model=TaskChanges)
+async def get_task_changes(
+    user_id: int,
+    since: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Get tasks created, updated or deleted since a sync token.
+    
+    Without `since`, or when the token predates tombstone retention, the full
+    task list is returned with `reset` set and the client should replace its
+    local copy. Changes from the last TASK_SYNC_OVERLAP_SECONDS before the
+    token are re-sent to cover transactions that committed late; clients
+    apply them idempotently.
+    
+    Args:
+        user_id: User ID from path
+        since: `next_token` from the previous sync
+        current_user: Current authenticated user
+        session: Database session
+        
+    Returns:
+        Changed tasks, deleted task IDs and the token for the next sync
+    """
+    verify_user_access(current_user, user_id)
+    
+    synced_at = datetime.utcnow()
+    version = await get_task_version(session, user_id)
+    next_token = encode_sync_token(version, synced_at)
+    
+    since_version, since_at = decode_sync_token(since) if since else (None, None)
+    reset = since_at is None or since_at < tombstone_horizon()
+    
+    if not reset and since_version == version:
+        # Nothing was written since the token was issued
+        return TaskChanges(changed=[], deleted=[], next_token=since, version=version)
+    
+    statement = select(Task).where(Task.user_id == user_id)
+    deleted_ids = []
+    if not reset:
+        window_start = since_at - timedelta(seconds=settings.TASK_SYNC_OVERLAP_SECONDS)
+        statement = statement.where(Task.updated_at > window_start)
+        tombstones = select(DeletedTask.task_id).where(
+            DeletedTask.user_id == user_id,
+            DeletedTask.deleted_at > window_start
+        )
+        deleted_ids = list(dict.fromkeys((await session.exec(tombstones)).all()))
+    
+    tasks = (await session.exec(statement.order_by(Task.updated_at))).all()
+    
+    return TaskChanges.model_validate(
+        {
+            "changed": tasks,
+            "deleted": deleted_ids,
+            "next_token": next_token,
+            "version": version,
+            "reset": reset
+        },
+        from_attributes=True
+    )
+
+
+@router.get("/{user_id}/tasks/search", response_model=TaskSearchPage)
+async def search_tasks(
+    user_id: int,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(
+        default=settings.TASKS_PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.TASKS_PAGE_MAX_LIMIT
+    ),
+    offset: int = Query(default=0, ge=0),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Full-text search over task titles and descriptions.
+    
+    Args:
+        user_id: User ID from path
+        q: Search text
+        limit: Maximum number of results per page
+        offset: Number of results to skip
+        current_user: Current authenticated user
+        session: Database session
+        
+    Returns:
+        Matching tasks ranked by relevance
+    """
+    verify_user_access(current_user, user_id)
+    
+    hits = await run_task_search(session, user_id, q, limit + 1, offset)
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+    
+    return TaskSearchPage(
+        items=[
+            TaskSearchHit(**TaskResponse.model_validate(task).model_dump(), score=score)
+            for task, score in hits
+        ],
+        next_offset=offset + limit if has_more else None
+    )
+
+
+@router.get("/{user_id}/tasks/stats", response_model=TaskStats)
+async def get_task_stats(
+    user_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    recount: bool = False,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Get task totals and, for a date range, created/completed counts per day.
+    
+    Totals come from the per-user counters maintained by every write path,
+    so they cost a primary-key lookup. Per-day counts are aggregated over the
+    requested range only (UTC days, at most a year).
+    
+    Args:
+        user_id: User ID from path
+        start: First day of the range (defaults to 29 days before `end`)
+        end: Last day of the range (defaults to today)
+        recount: Recompute the counters from the tasks table
+        current_user: Current authenticated user
+        session: Database session
+        
+    Returns:
+        Task statistics
+    """
+    verify_user_access(current_user, user_id)
+    
+    if recount:
+        total, completed = await recount_tasks(session, user_id)
+    else:
+        total, completed = await get_task_counts(session, user_id)
+    await session.commit()  # Persist counters if they had to be recounted
+    
+    stats = TaskStats(total=total, completed=completed, pending=total - completed)
+    if start is None and end is None:
+        return stats
+    
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days >= 366:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range must be non-empty and at most 366 days"
+        )
+    
+    range_start = datetime.combine(start, time.min)
+    range_end = datetime.combine(end + timedelta(days=1), time.min)
+    daily = {
+        start + timedelta(days=offset): {"created": 0, "completed": 0}
+        for offset in range((end - start).days + 1)
+    }
+    
+    for column, key in ((Task.created_at, "created"), (Task.completed_at, "completed")):
+        day = func.date(column)
+        statement = (
+            select(day, func.count(Task.id))
+            .where(Task.user_id == user_id, column >= range_start, column < range_end)
+            .group_by(day)
+        )
+        for day_value, count in (await session.exec(statement)).all():
+            daily[date.fromisoformat(str(day_value))][key] = count
+    
+    stats.start = start
+    stats.end = end
+    stats.daily = [
+        DailyTaskCount(day=day, **counts) for day, counts in sorted(daily.items())
+    ]
+    return stats
+
+
 @router.get("/{user_id}/tasks/{task_id}", response_model=TaskResponse)
 async def get_task(
     user_id: int,
     task_id: int,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Get a specific task.
     
+    The response carries the task's version as its ETag; send it back as
+    If-Match on writes to make them conditional.
+    
     Args:
         user_id: User ID from path
         task_id: Task ID
+        response: Outgoing response (for ETag)
         current_user: Current authenticated user
         session: Database session
         
@@ -90,7 +823,8 @@ async def get_task(
     """
     verify_user_access(current_user, user_id)
     
-    task = session.get(Task, task_id)
+    # A single primary-key lookup; a cache in front of it would save nothing
+    task = await session.get(Task, task_id)
     
     if not task or task.user_id != user_id:
         raise HTTPException(
@@ -98,6 +832,7 @@ async def get_task(
             detail="Task not found"
         )
     
+    response.headers["ETag"] = task_etag(task.version)
     return task
 
 
@@ -106,8 +841,10 @@ async def update_task(
     user_id: int,
     task_id: int,
     task_data: TaskUpdate,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Update a task.
@@ -116,36 +853,42 @@ async def update_task(
         user_id: User ID from path
         task_id: Task ID
         task_data: Task update data
+        request: Incoming request (for If-Match)
+        response: Outgoing response (for ETag)
         current_user: Current authenticated user
         session: Database session
         
     Returns:
         Updated task
+        
+    Raises:
+        HTTPException: 404 if the task does not exist, 412 if If-Match is stale
     """
     verify_user_access(current_user, user_id)
+    expected_version = parse_if_match(request.headers.get("if-match"))
     
-    task = session.get(Task, task_id)
-    
-    if not task or task.user_id != user_id:
+    values = task_data.model_dump(include={"title", "description"}, exclude_none=True)
+    try:
+        updated = await update_task_row(
+            session, user_id, task_id, values,
+            completed=task_data.completed,
+            expected_version=expected_version
+        )
+    except TaskVersionConflict as e:
+        raise version_conflict(e)
+    if updated is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    # Update fields
-    if task_data.title is not None:
-        task.title = task_data.title
-    if task_data.description is not None:
-        task.description = task_data.description
-    if task_data.completed is not None:
-        task.completed = task_data.completed
-    
-    task.updated_at = datetime.utcnow()
-    
-    session.add(task)
-    session.commit()
-    session.refresh(task)
+    task, completed_delta = updated
+    await record_task_change(
+        session, user_id, task_ids=[task_id], completed_delta=completed_delta
+    )
+    await commit_task_changes(session)
     
+    response.headers["ETag"] = task_etag(task.version)
     return task
 
 
@@ -153,8 +896,9 @@ async def update_task(
 async def delete_task(
     user_id: int,
     task_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Delete a task.
@@ -162,29 +906,43 @@ async def delete_task(
     Args:
         user_id: User ID from path
         task_id: Task ID
+        request: Incoming request (for If-Match)
         current_user: Current authenticated user
         session: Database session
+        
+    Raises:
+        HTTPException: 404 if the task does not exist, 412 if If-Match is stale
     """
     verify_user_access(current_user, user_id)
+    expected_version = parse_if_match(request.headers.get("if-match"))
     
-    task = session.get(Task, task_id)
-    
-    if not task or task.user_id != user_id:
+    try:
+        completed_delta = await delete_task_row(session, user_id, task_id, expected_version)
+    except TaskVersionConflict as e:
+        raise version_conflict(e)
+    if completed_delta is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    session.delete(task)
-    session.commit()
+    await record_task_change(
+        session, user_id,
+        deleted_ids=[task_id],
+        total_delta=-1,
+        completed_delta=completed_delta
+    )
+    await commit_task_changes(session)
 
 
 @router.patch("/{user_id}/tasks/{task_id}/complete", response_model=TaskResponse)
 async def toggle_task_completion(
     user_id: int,
     task_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Toggle task completion status.
@@ -192,27 +950,35 @@ async def toggle_task_completion(
     Args:
         user_id: User ID from path
         task_id: Task ID
+        request: Incoming request (for If-Match)
+        response: Outgoing response (for ETag)
         current_user: Current authenticated user
         session: Database session
         
     Returns:
         Updated task
+        
+    Raises:
+        HTTPException: 404 if the task does not exist, 412 if If-Match is stale
     """
     verify_user_access(current_user, user_id)
+    expected_version = parse_if_match(request.headers.get("if-match"))
     
-    task = session.get(Task, task_id)
-    
-    if not task or task.user_id != user_id:
+    try:
+        toggled = await toggle_task_row(session, user_id, task_id, expected_version)
+    except TaskVersionConflict as e:
+        raise version_conflict(e)
+    if toggled is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    task.completed = not task.completed
-    task.updated_at = datetime.utcnow()
-    
-    session.add(task)
-    session.commit()
-    session.refresh(task)
+    task, completed_delta = toggled
+    await record_task_change(
+        session, user_id, task_ids=[task_id], completed_delta=completed_delta
+    )
+    await commit_task_changes(session)
     
+    response.headers["ETag"] = task_etag(task.version)
     return task
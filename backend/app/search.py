@@ -0,0 +1,158 @@
+"""
+Full-text search over task titles and descriptions.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers;
+PostgreSQL uses a generated, weighted tsvector column with a GIN index. Both
+are maintained by the database itself, so every write path (router, batch,
+import, MCP tools) keeps the index current without extra code. Other
+dialects fall back to a case-insensitive LIKE scan.
+"""
+
+import re
+from typing import List, Tuple
+
+from sqlalchemy import column, func, literal, literal_column, or_, table
+from sqlalchemy.engine import Connection
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Task
+
+
+_SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    # Index rows that existed before the FTS table was created
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+]
+
+_POSTGRES_FTS_DDL = [
+    """
+    ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+]
+
+_tasks_fts = table("tasks_fts", column("rowid"))
+
+
+def install_search_index(connection: Connection) -> None:
+    """
+    Create the dialect-specific full-text index if it does not exist yet.
+
+    Args:
+        connection: Sync connection inside an open transaction
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        ).first()
+        if not exists:
+            for ddl in _SQLITE_FTS_DDL:
+                connection.exec_driver_sql(ddl)
+    elif dialect == "postgresql":
+        for ddl in _POSTGRES_FTS_DDL:
+            connection.exec_driver_sql(ddl)
+
+
+def to_fts5_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query (all terms, prefix-matched).
+
+    Args:
+        query: User-supplied search text
+
+    Returns:
+        FTS5 MATCH expression, or an empty string if there are no terms
+    """
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+async def search_tasks(
+    session: AsyncSession,
+    user_id: int,
+    query: str,
+    limit: int,
+    offset: int = 0
+) -> List[Tuple[Task, float]]:
+    """
+    Search a user's tasks, best matches first.
+
+    Args:
+        session: Database session
+        user_id: Owner of the tasks
+        query: Free-text search query
+        limit: Maximum number of results
+        offset: Number of results to skip
+
+    Returns:
+        List of (task, score) tuples; higher scores are better matches
+    """
+    dialect = session.bind.dialect.name
+
+    if dialect == "sqlite":
+        match = to_fts5_query(query)
+        if not match:
+            return []
+        # bm25() is lower-is-better; title matches weigh more than description
+        score = (-func.bm25(literal_column("tasks_fts"), 10.0, 1.0)).label("score")
+        statement = (
+            select(Task, score)
+            .join(_tasks_fts, _tasks_fts.c.rowid == Task.id)
+            .where(literal_column("tasks_fts").op("MATCH")(match))
+        )
+    elif dialect == "postgresql":
+        if not query.strip():
+            return []
+        ts_query = func.websearch_to_tsquery("english", query)
+        search_vector = literal_column("tasks.search_vector")
+        score = func.ts_rank_cd(search_vector, ts_query).label("score")
+        statement = select(Task, score).where(search_vector.op("@@")(ts_query))
+    else:
+        if not query.strip():
+            return []
+        pattern = f"%{query.strip()}%"
+        score = literal(0.0).label("score")
+        statement = select(Task, score).where(
+            or_(Task.title.ilike(pattern), Task.description.ilike(pattern))
+        )
+
+    statement = (
+        statement
+        .where(Task.user_id == user_id)
+        .order_by(score.desc(), Task.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    return [(task, float(rank)) for task, rank in (await session.exec(statement)).all()]
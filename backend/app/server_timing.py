@@ -0,0 +1,90 @@
+"""
+Per-request time breakdown in the `Server-Timing` response header.
+
+With SERVER_TIMING_ENABLED every response carries a header such as
+
+    Server-Timing: db;dur=4.1, llm;dur=812.6, tool;dur=3.0, total;dur=825.9
+
+where `db` is time spent executing SQL (measured with SQLAlchemy cursor
+events), `llm` is time spent in requests to the AI provider including
+reading their bodies (measured by the shared client's transport) and `tool`
+is time spent in chat tools. Work running concurrently within a request
+(e.g. read-only tools) is summed, so the parts can exceed `total`.
+
+Streaming responses send their headers before the body, so for them the
+header only covers the time up to the first byte. The load-test harness
+(`benchmarks/load_chat.py`) reads this header; it is off by default because
+it reveals internal timings to clients.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def add_timing(name: str, seconds: float) -> None:
+    """Add `seconds` to the current request's `name` total (no-op outside a timed request)."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def format_server_timing(timings: Dict[str, float], total: float) -> str:
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in sorted(timings.items())]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware that collects timings for each HTTP request and reports them."""
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                header = format_server_timing(timings, time.perf_counter() - started)
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"server-timing", header.encode("latin-1"))]
+                }
+            await send(message)
+
+        token = _request_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+
+
+def install_db_timing(engine: AsyncEngine) -> None:
+    """Count the execution time of every SQL statement on `engine` as `db`."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("server_timing_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def finish_query(conn, cursor, statement, parameters, context, executemany):
+        add_timing("db", time.perf_counter() - conn.info["server_timing_started"].pop())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def fail_query(exception_context):
+        connection = exception_context.connection
+        started = connection.info.get("server_timing_started") if connection is not None else None
+        if started:
+            add_timing("db", time.perf_counter() - started.pop())
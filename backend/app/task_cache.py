@@ -0,0 +1,92 @@
+"""
+Per-user cache of task lists.
+
+An entry holds the user's full list as dicts of TaskResponse fields: JSON
+values when built from ORM rows, raw column values (datetimes included)
+on the TASKS_FAST_JSON path, which serializes them with orjson. Every
+entry is tagged with the user's task collection version it was read at,
+and readers only use an entry whose tag equals the version they just read
+from the database (`get_task_version`, a primary-key lookup made before
+any rows are loaded). Every task write bumps that version, so an entry can
+never be served after a write, whichever worker handled the write and
+whether or not the backend is shared between workers.
+
+`invalidate`, called from `app.task_changes.commit_task_changes`, only
+frees the entry of the worker that made the write; in other workers the
+stale entries simply stop matching and age out of the LRU. Single tasks
+are not cached: reading one is a primary-key lookup already.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from app.cache import CacheBackend, InMemoryLRUCache
+from app.config import settings
+from app.models import Task, TaskResponse
+
+
+def serialize_task(task: Task) -> Dict[str, Any]:
+    """Serialize a task exactly as the API returns it."""
+    return TaskResponse.model_validate(task).model_dump(mode="json")
+
+
+class TaskCache:
+    """Read-through cache for task lists, validated against the collection version."""
+    
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.stale = 0
+    
+    @staticmethod
+    def list_key(user_id: int) -> str:
+        return f"tasks:{user_id}:list"
+    
+    async def _get(self, key: str, version: int) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        entry = await self.backend.get(key)
+        if entry is None:
+            return None
+        if entry["version"] != version:
+            # Written at another version (possibly by another worker)
+            self.stale += 1
+            return None
+        return entry
+    
+    async def get_list(self, user_id: int, version: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the user's full list (newest first), if cached at `version`.
+        
+        Args:
+            user_id: Owner of the tasks
+            version: Collection version just read from the database
+        """
+        entry = await self._get(self.list_key(user_id), version)
+        return entry["tasks"] if entry else None
+    
+    async def set_list(self, user_id: int, version: int, tasks: List[Dict[str, Any]]) -> None:
+        """Cache the full list, tagged with the collection version read before loading it."""
+        if self.enabled:
+            await self.backend.set(self.list_key(user_id), {"version": version, "tasks": tasks})
+    
+    async def invalidate(self, user_id: int) -> None:
+        """Drop a user's list entry after a write."""
+        if self.enabled:
+            await self.backend.delete(self.list_key(user_id))
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "stale": self.stale, **self.backend.stats()}
+
+
+task_cache = TaskCache(
+    InMemoryLRUCache(
+        max_entries=settings.TASK_CACHE_MAX_ENTRIES,
+        ttl=settings.TASK_CACHE_TTL_SECONDS
+    ),
+    enabled=settings.TASK_CACHE_ENABLED
+)
+
+
+def set_task_cache_backend(backend: CacheBackend) -> None:
+    """Swap in a different backend (e.g. a cache shared across workers)."""
+    task_cache.backend = backend
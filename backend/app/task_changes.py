@@ -0,0 +1,563 @@
+"""
+Bookkeeping shared by every code path that writes tasks.
+
+Each user's task collection carries a monotonically increasing version that
+is bumped in the same transaction as the write. Readers use it to answer
+conditional requests without running the task query. Deletions also leave a
+tombstone in `deleted_tasks` so delta-sync clients learn about them; old
+tombstones are compacted away after TASK_TOMBSTONE_RETENTION_DAYS.
+
+The collection also keeps total/completed counters, adjusted by deltas that
+each writer passes in, so task statistics are a primary-key lookup.
+
+Writers commit through `commit_task_changes`, which runs the post-commit
+side effects (cache invalidation, change events) for everything recorded in
+the session.
+
+Single-task writes go through `update_task_row`, `toggle_task_row` and
+`delete_task_row`: one UPDATE/DELETE ... RETURNING statement each. Every
+write bumps the task's own `version` in SQL; passing `expected_version`
+turns the write into a compare-and-swap that raises `TaskVersionConflict`
+when another writer got there first. `update_task_rows`, `toggle_task_rows`
+and `delete_task_rows` apply unconditional writes to many tasks in one
+statement.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, event, func, insert, not_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import events
+from app.config import settings
+from app.database import async_engine
+from app.models import DeletedTask, Task, TaskCollection
+from app.task_cache import task_cache
+
+
+_PENDING_KEY = "pending_task_changes"
+
+
+def _pending_changes(session: AsyncSession, user_id: int) -> Dict[str, Any]:
+    """Changes recorded for a user in the session's open transaction."""
+    pending = session.sync_session.info.setdefault(_PENDING_KEY, {})
+    return pending.setdefault(user_id, {"version": 0, "task_ids": set(), "deleted_ids": set()})
+
+
+def has_pending_changes(session: AsyncSession, user_id: int) -> bool:
+    """Whether the session's open transaction holds uncommitted task writes for the user."""
+    return user_id in session.sync_session.info.get(_PENDING_KEY, {})
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_changes(session: Session, previous_transaction: SessionTransaction) -> None:
+    """Forget recorded changes when the outermost transaction rolls back."""
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+class TaskVersionConflict(Exception):
+    """A compare-and-swap write found the task at a different version."""
+    
+    def __init__(self, task_id: int, current_version: int):
+        super().__init__(
+            f"Task {task_id} was modified by someone else (now at version {current_version})"
+        )
+        self.task_id = task_id
+        self.current_version = current_version
+
+
+def _task_row_filter(user_id: int, task_id: int, expected_version: Optional[int]) -> list:
+    conditions = [Task.id == task_id, Task.user_id == user_id]
+    if expected_version is not None:
+        conditions.append(Task.version == expected_version)
+    return conditions
+
+
+async def _check_version_conflict(
+    session: AsyncSession, user_id: int, task_id: int, expected_version: Optional[int]
+) -> None:
+    """
+    Explain why a conditional write matched no row.
+    
+    Only runs after a failed write: if the task exists, the version check
+    was what failed.
+    
+    Raises:
+        TaskVersionConflict: If the task exists at another version
+    """
+    if expected_version is None:
+        return
+    statement = select(Task.version).where(Task.id == task_id, Task.user_id == user_id)
+    current_version = (await session.exec(statement)).first()
+    if current_version is not None:
+        raise TaskVersionConflict(task_id, current_version)
+
+
+async def update_task_row(
+    session: AsyncSession,
+    user_id: int,
+    task_id: int,
+    values: Dict[str, Any],
+    completed: Optional[bool] = None,
+    expected_version: Optional[int] = None
+) -> Optional[Tuple[Task, int]]:
+    """
+    Update a task's fields in a single UPDATE ... RETURNING statement.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the task
+        task_id: Task to update
+        values: Column values to set (title, description)
+        completed: New completion state, if it changes
+        expected_version: Only update if the task is still at this version
+        
+    Returns:
+        Tuple of (updated task, change in the completed count), or None if
+        the user has no such task
+        
+    Raises:
+        TaskVersionConflict: If `expected_version` is stale
+    """
+    now = datetime.utcnow()
+    values = {**values, "updated_at": now, "version": Task.version + 1}
+    statement = update(Task).where(*_task_row_filter(user_id, task_id, expected_version))
+    returning = [Task]
+    
+    if completed is not None:
+        values["completed"] = completed
+        values["completed_at"] = case(
+            (Task.completed == completed, Task.completed_at),
+            else_=now if completed else None
+        )
+        # The completed count needs the previous state. A materialized CTE
+        # referenced by the WHERE clause is evaluated before any row changes
+        # (RETURNING alone only sees the new row on SQLite).
+        previous = (
+            select(Task.id, Task.completed)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .with_for_update()
+            .cte("previous_task")
+            .prefix_with("MATERIALIZED")
+        )
+        statement = statement.where(Task.id.in_(select(previous.c.id)))
+        returning.append(select(previous.c.completed).scalar_subquery())
+    
+    statement = (
+        statement
+        .values(**values)
+        .returning(*returning)
+        .execution_options(populate_existing=True)
+    )
+    row = (await session.exec(statement)).first()
+    if row is None:
+        await _check_version_conflict(session, user_id, task_id, expected_version)
+        return None
+    
+    task = row[0]
+    completed_delta = int(task.completed) - int(row[1]) if completed is not None else 0
+    return task, completed_delta
+
+
+async def toggle_task_row(
+    session: AsyncSession,
+    user_id: int,
+    task_id: int,
+    expected_version: Optional[int] = None
+) -> Optional[Tuple[Task, int]]:
+    """
+    Flip a task's completion state in a single UPDATE ... RETURNING statement.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the task
+        task_id: Task to toggle
+        expected_version: Only toggle if the task is still at this version
+        
+    Returns:
+        Tuple of (updated task, change in the completed count), or None if
+        the user has no such task
+        
+    Raises:
+        TaskVersionConflict: If `expected_version` is stale
+    """
+    now = datetime.utcnow()
+    statement = (
+        update(Task)
+        .where(*_task_row_filter(user_id, task_id, expected_version))
+        .values(
+            completed=not_(Task.completed),
+            completed_at=case((Task.completed == True, None), else_=now),  # noqa: E712
+            updated_at=now,
+            version=Task.version + 1
+        )
+        .returning(Task)
+        .execution_options(populate_existing=True)
+    )
+    task = (await session.exec(statement)).scalars().first()
+    if task is None:
+        await _check_version_conflict(session, user_id, task_id, expected_version)
+        return None
+    return task, 1 if task.completed else -1
+
+
+async def delete_task_row(
+    session: AsyncSession,
+    user_id: int,
+    task_id: int,
+    expected_version: Optional[int] = None
+) -> Optional[int]:
+    """
+    Delete a task in a single DELETE ... RETURNING statement.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the task
+        task_id: Task to delete
+        expected_version: Only delete if the task is still at this version
+        
+    Returns:
+        Change in the completed count (-1 or 0), or None if the user has no
+        such task
+        
+    Raises:
+        TaskVersionConflict: If `expected_version` is stale
+    """
+    statement = (
+        delete(Task)
+        .where(*_task_row_filter(user_id, task_id, expected_version))
+        .returning(Task.completed)
+    )
+    was_completed = (await session.exec(statement)).scalars().first()
+    if was_completed is None:
+        await _check_version_conflict(session, user_id, task_id, expected_version)
+        return None
+    return -int(was_completed)
+
+
+async def update_task_rows(
+    session: AsyncSession,
+    user_id: int,
+    changes: Dict[int, Dict[str, Any]],
+    write_counts: Dict[int, int]
+) -> Dict[int, int]:
+    """
+    Update several tasks in a single UPDATE ... RETURNING statement.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the tasks
+        changes: Task ID -> column values to set (title, description, completed)
+        write_counts: Task ID -> number of writes merged into its values; the
+            task's version is bumped once per write
+        
+    Returns:
+        Task ID -> change in the completed count, for the tasks the user owns
+    """
+    now = datetime.utcnow()
+    values: Dict[str, Any] = {
+        "updated_at": now,
+        "version": Task.version + case(write_counts, value=Task.id, else_=0)
+    }
+    for name in ("title", "description", "completed"):
+        new_values = {task_id: row[name] for task_id, row in changes.items() if name in row}
+        if new_values:
+            values[name] = case(new_values, value=Task.id, else_=getattr(Task, name))
+    
+    done_ids = [task_id for task_id, row in changes.items() if row.get("completed") is True]
+    open_ids = [task_id for task_id, row in changes.items() if row.get("completed") is False]
+    if done_ids or open_ids:
+        values["completed_at"] = case(
+            (Task.id.in_(open_ids), None),
+            (and_(Task.id.in_(done_ids), Task.completed == False), now),  # noqa: E712
+            else_=Task.completed_at
+        )
+    
+    # Previous completion states, evaluated before any row changes (see update_task_row)
+    previous = (
+        select(Task.id, Task.completed)
+        .where(Task.user_id == user_id, Task.id.in_(list(changes)))
+        .with_for_update()
+        .cte("previous_tasks")
+        .prefix_with("MATERIALIZED")
+    )
+    was_completed = (
+        select(previous.c.completed)
+        .where(previous.c.id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+    )
+    statement = (
+        update(Task)
+        .where(Task.user_id == user_id, Task.id.in_(select(previous.c.id)))
+        .values(**values)
+        .returning(Task.id, Task.completed, was_completed)
+    )
+    return {
+        task_id: int(completed) - int(previous_completed)
+        for task_id, completed, previous_completed in (await session.exec(statement)).all()
+    }
+
+
+async def toggle_task_rows(
+    session: AsyncSession,
+    user_id: int,
+    toggle_counts: Dict[int, int]
+) -> Dict[int, int]:
+    """
+    Toggle several tasks in a single UPDATE ... RETURNING statement.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the tasks
+        toggle_counts: Task ID -> number of toggles; an even number leaves the
+            completion state as it is, but every toggle bumps the version
+        
+    Returns:
+        Task ID -> change in the completed count, for the tasks the user owns
+    """
+    now = datetime.utcnow()
+    flip_ids = [task_id for task_id, count in toggle_counts.items() if count % 2]
+    flipped = Task.id.in_(flip_ids)
+    statement = (
+        update(Task)
+        .where(Task.user_id == user_id, Task.id.in_(list(toggle_counts)))
+        .values(
+            completed=case((flipped, not_(Task.completed)), else_=Task.completed),
+            completed_at=case(
+                (and_(flipped, Task.completed == True), None),  # noqa: E712
+                (flipped, now),
+                else_=Task.completed_at
+            ),
+            updated_at=now,
+            version=Task.version + case(toggle_counts, value=Task.id, else_=0)
+        )
+        .returning(Task.id, Task.completed)
+    )
+    return {
+        task_id: (1 if completed else -1) if task_id in flip_ids else 0
+        for task_id, completed in (await session.exec(statement)).all()
+    }
+
+
+async def delete_task_rows(session: AsyncSession, user_id: int, task_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Delete several tasks in a single DELETE ... RETURNING statement.
+    
+    Returns:
+        Task ID -> change in the completed count (-1 or 0), for the tasks
+        the user owned
+    """
+    statement = (
+        delete(Task)
+        .where(Task.user_id == user_id, Task.id.in_(list(task_ids)))
+        .returning(Task.id, Task.completed)
+    )
+    return {task_id: -int(completed) for task_id, completed in (await session.exec(statement)).all()}
+
+
+async def get_task_version(session: AsyncSession, user_id: int) -> int:
+    """
+    Get the current version of a user's task collection.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the collection
+        
+    Returns:
+        Current version (0 if the user never wrote a task)
+    """
+    statement = select(TaskCollection.version).where(TaskCollection.user_id == user_id)
+    version = (await session.exec(statement)).first()
+    return version or 0
+
+
+async def record_task_change(
+    session: AsyncSession,
+    user_id: int,
+    task_ids: Iterable[int] = (),
+    deleted_ids: Iterable[int] = (),
+    total_delta: int = 0,
+    completed_delta: int = 0
+) -> int:
+    """
+    Record that a user's tasks changed in the current transaction.
+    
+    Must be called before the caller commits so the version bump and
+    tombstones are atomic with the write itself. The caller then commits
+    with `commit_task_changes`.
+    
+    Args:
+        session: Database session holding the uncommitted write
+        user_id: Owner of the changed tasks
+        task_ids: IDs of tasks that were created or updated
+        deleted_ids: IDs of tasks deleted by the write
+        total_delta: Change in the user's number of tasks
+        completed_delta: Change in the user's number of completed tasks
+        
+    Returns:
+        The new collection version
+    """
+    deleted_ids = list(deleted_ids)
+    pending = _pending_changes(session, user_id)
+    pending["task_ids"].update(task_ids)
+    pending["deleted_ids"].update(deleted_ids)
+    if deleted_ids:
+        now = datetime.utcnow()
+        await session.exec(
+            insert(DeletedTask),
+            params=[
+                {"user_id": user_id, "task_id": task_id, "deleted_at": now}
+                for task_id in deleted_ids
+            ]
+        )
+    
+    values = {"version": TaskCollection.version + 1}
+    if total_delta:
+        values["total_count"] = TaskCollection.total_count + total_delta
+    if completed_delta:
+        values["completed_count"] = TaskCollection.completed_count + completed_delta
+    
+    statement = (
+        update(TaskCollection)
+        .where(TaskCollection.user_id == user_id)
+        .values(**values)
+        .returning(TaskCollection.version)
+    )
+    version = (await session.exec(statement)).scalar_one_or_none()
+    if version is None:
+        # First write for this user: create the row (counters unknown until
+        # the first recount), tolerating a concurrent insert
+        try:
+            async with session.begin_nested():
+                session.add(TaskCollection(user_id=user_id, version=1))
+            version = 1
+        except IntegrityError:
+            version = (await session.exec(statement)).scalar_one()
+    
+    pending["version"] = version
+    return version
+
+
+async def get_task_counts(session: AsyncSession, user_id: int) -> Tuple[int, int]:
+    """
+    Get a user's (total, completed) task counts from the maintained counters.
+    
+    Falls back to `recount_tasks` when the counters are unknown, in which
+    case the caller should commit to persist the recount.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the tasks
+        
+    Returns:
+        Tuple of (total tasks, completed tasks)
+    """
+    statement = select(
+        TaskCollection.total_count, TaskCollection.completed_count
+    ).where(TaskCollection.user_id == user_id)
+    counts = (await session.exec(statement)).first()
+    if counts is not None and None not in counts:
+        return counts[0], counts[1]
+    return await recount_tasks(session, user_id)
+
+
+async def recount_tasks(session: AsyncSession, user_id: int) -> Tuple[int, int]:
+    """
+    Recompute a user's counters with aggregate queries and store them.
+    
+    The caller is responsible for committing.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the tasks
+        
+    Returns:
+        Tuple of (total tasks, completed tasks)
+    """
+    total = select(func.count(Task.id)).where(Task.user_id == user_id).scalar_subquery()
+    completed = (
+        select(func.count(Task.id))
+        .where(Task.user_id == user_id, Task.completed == True)  # noqa: E712
+        .scalar_subquery()
+    )
+    
+    # A single UPDATE keeps the recount atomic with respect to concurrent writers
+    statement = (
+        update(TaskCollection)
+        .where(TaskCollection.user_id == user_id)
+        .values(total_count=total, completed_count=completed)
+        .returning(TaskCollection.total_count, TaskCollection.completed_count)
+    )
+    counts = (await session.exec(statement)).first()
+    if counts is None:
+        counts = (await session.exec(select(total, completed))).one()
+        try:
+            async with session.begin_nested():
+                session.add(TaskCollection(
+                    user_id=user_id, total_count=counts[0], completed_count=counts[1]
+                ))
+        except IntegrityError:
+            pass
+    return counts[0], counts[1]
+
+
+async def commit_task_changes(session: AsyncSession) -> None:
+    """
+    Commit the session, then apply post-commit effects of recorded changes:
+    cache invalidation and one change event per user.
+    
+    Args:
+        session: Database session with changes recorded by `record_task_change`
+    """
+    await session.commit()
+    pending = session.sync_session.info.pop(_PENDING_KEY, {})
+    for user_id, change in pending.items():
+        deleted_ids = change["deleted_ids"]
+        await task_cache.invalidate(user_id)
+        await events.task_events.publish(user_id, {
+            "type": "tasks",
+            "version": change["version"],
+            "changed": sorted(change["task_ids"] - deleted_ids),
+            "deleted": sorted(deleted_ids),
+        })
+
+
+def tombstone_horizon() -> datetime:
+    """Oldest point in time for which tombstones are still guaranteed to exist."""
+    return datetime.utcnow() - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+
+
+async def compact_tombstones(session: AsyncSession) -> int:
+    """
+    Delete tombstones older than the retention window.
+    
+    Args:
+        session: Database session
+        
+    Returns:
+        Number of tombstones removed
+    """
+    statement = delete(DeletedTask).where(DeletedTask.deleted_at < tombstone_horizon())
+    result = await session.exec(statement)
+    await session.commit()
+    return result.rowcount
+
+
+async def run_tombstone_compaction() -> None:
+    """Background loop compacting the deleted-task log until cancelled."""
+    while True:
+        try:
+            async with AsyncSession(async_engine) as session:
+                removed = await compact_tombstones(session)
+            if removed:
+                print(f"Compacted {removed} task tombstones")
+        except Exception as e:
+            print(f"Tombstone compaction failed: {e}")
+        await asyncio.sleep(settings.TASK_TOMBSTONE_COMPACTION_INTERVAL_SECONDS)
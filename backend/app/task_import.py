@@ -0,0 +1,180 @@
+"""
+Bulk task import from NDJSON or CSV files.
+
+Files are parsed incrementally and written in batches of
+TASKS_IMPORT_BATCH_SIZE rows: one multi-row INSERT (COPY on PostgreSQL), one
+version bump and one commit per batch. Progress and per-row errors are
+reported as NDJSON events while the import runs, so neither the file nor the
+result list is ever held in memory.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.database import async_engine
+from app.models import Task, TaskImportRow
+from app.task_changes import commit_task_changes, record_task_change
+
+
+IMPORT_COLUMNS = [
+    "user_id", "title", "description", "completed", "completed_at", "created_at", "updated_at"
+]
+
+# (line number, parsed fields or an error message)
+ParsedLine = Tuple[int, Any]
+
+
+def parse_ndjson(stream: io.TextIOBase) -> Iterator[ParsedLine]:
+    """Yield (line number, object) for every non-blank NDJSON line."""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"Invalid JSON: {e.msg}"
+
+
+def parse_csv(stream: io.TextIOBase) -> Iterator[ParsedLine]:
+    """Yield (line number, row) for every CSV record; empty cells become missing fields."""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {
+            key: value for key, value in row.items()
+            if key is not None and value not in (None, "")
+        }
+
+
+def read_batch(lines: Iterator[ParsedLine], size: int) -> List[ParsedLine]:
+    """
+    Read up to `size` parsed lines (blocking file I/O; run in a thread).
+
+    If the file stops being readable, the lines read so far are returned
+    followed by an error entry; the exhausted parser then ends the import.
+    """
+    batch: List[ParsedLine] = []
+    try:
+        for parsed in islice(lines, size):
+            batch.append(parsed)
+    except (UnicodeDecodeError, csv.Error) as e:
+        batch.append((0, f"Unreadable file: {e}"))
+    return batch
+
+
+def to_row(user_id: int, fields: Any, now: datetime) -> Dict[str, Any]:
+    """
+    Validate parsed fields and build an INSERT row.
+
+    Raises:
+        ValueError: If the fields do not describe a valid task
+    """
+    if not isinstance(fields, dict):
+        raise ValueError(fields if isinstance(fields, str) else "Expected a JSON object")
+    try:
+        task = TaskImportRow.model_validate(fields)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        ))
+    return {
+        "user_id": user_id,
+        "title": task.title,
+        "description": task.description,
+        "completed": task.completed,
+        "completed_at": now if task.completed else None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+async def insert_rows(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Insert a batch of task rows with COPY on PostgreSQL, executemany elsewhere."""
+    if session.bind.dialect.name == "postgresql":
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Task.__tablename__,
+            records=[tuple(row[column] for column in IMPORT_COLUMNS) for row in rows],
+            columns=IMPORT_COLUMNS,
+        )
+    else:
+        await session.exec(insert(Task), params=rows)
+
+
+def event(name: str, **fields: Any) -> str:
+    """Serialize one progress event as an NDJSON line."""
+    return json.dumps({"event": name, **fields}) + "\n"
+
+
+async def import_tasks(source: BinaryIO, file_format: str, user_id: int) -> AsyncIterator[str]:
+    """
+    Import tasks from an uploaded file, yielding NDJSON progress events.
+
+    Emits an `error` event per rejected row, a `progress` event after each
+    committed batch and a final `done` event. Batches are committed
+    independently, so rows imported before a failure are kept.
+
+    Args:
+        source: Binary file object; closed when the import finishes
+        file_format: "ndjson" or "csv"
+        user_id: Owner of the imported tasks
+
+    Yields:
+        NDJSON-encoded events
+    """
+    processed = imported = failed = 0
+    stream = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    lines = parse_csv(stream) if file_format == "csv" else parse_ndjson(stream)
+
+    try:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            while True:
+                batch = await run_in_threadpool(read_batch, lines, settings.TASKS_IMPORT_BATCH_SIZE)
+                if not batch:
+                    break
+
+                now = datetime.utcnow()
+                rows = []
+                for line_number, fields in batch:
+                    try:
+                        rows.append(to_row(user_id, fields, now))
+                    except ValueError as e:
+                        failed += 1
+                        yield event("error", line=line_number, error=str(e))
+                processed += len(batch)
+
+                if rows:
+                    try:
+                        await insert_rows(session, rows)
+                        await record_task_change(
+                            session, user_id,
+                            total_delta=len(rows),
+                            completed_delta=sum(1 for row in rows if row["completed"])
+                        )
+                        await commit_task_changes(session)
+                        imported += len(rows)
+                    except Exception as e:
+                        await session.rollback()
+                        failed += len(rows)
+                        yield event(
+                            "error",
+                            lines=[batch[0][0], batch[-1][0]],
+                            error=f"Batch failed: {e.__class__.__name__}"
+                        )
+
+                yield event("progress", processed=processed, imported=imported, failed=failed)
+
+        yield event("done", processed=processed, imported=imported, failed=failed)
+    finally:
+        stream.close()
@@ -0,0 +1,125 @@
+"""
+Concurrent-request throughput: sync Session vs AsyncSession handlers.
+
+Mounts two `async def` endpoints that run the same query, one through the
+legacy synchronous `get_session` dependency and one through
+`get_async_session`, and drives both with the same number of concurrent
+requests. A SQLite `sleep_ms()` function simulates a slow query so the effect
+of blocking the event loop is visible without a remote database.
+
+Keep --concurrency at or below the sync pool capacity (pool_size +
+max_overflow, 15 by default): past that the sync handlers block the event
+loop while waiting for a pooled connection that can only be returned by the
+event loop, and the "before" run stalls until the pool timeout.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_async_db --requests 200 --concurrency 10 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+_DB_PATH = os.path.join(tempfile.gettempdir(), "bench_async_db.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+os.environ.setdefault("DATABASE_ECHO", "false")
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import event, func  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.database import (  # noqa: E402
+    async_engine, engine, get_async_session, get_session,
+)
+
+
+def _install_sleep_function(dbapi_connection, connection_record):
+    """Register sleep_ms(ms) on every new SQLite connection."""
+    create_function = getattr(dbapi_connection, "create_function", None)
+    if create_function is None:
+        return
+
+    def sleep_ms(ms):
+        time.sleep(ms / 1000)
+        return ms
+
+    create_function("sleep_ms", 1, sleep_ms)
+
+
+def build_app(latency_ms: int) -> FastAPI:
+    """Build a tiny app exposing the same query on both session types."""
+    bench_app = FastAPI()
+    query = select(func.sleep_ms(latency_ms)) if latency_ms else select(1)
+
+    @bench_app.get("/sync")
+    async def sync_handler(session: Session = Depends(get_session)):
+        return {"value": session.exec(query).one()}
+
+    @bench_app.get("/async")
+    async def async_handler(session: AsyncSession = Depends(get_async_session)):
+        return {"value": (await session.exec(query)).one()}
+
+    return bench_app
+
+
+async def run_load(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> dict:
+    """Issue `requests` GETs with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _install_sleep_function)
+        event.listen(async_engine.sync_engine, "connect", _install_sleep_function)
+        latency_ms = args.latency_ms
+    else:
+        latency_ms = 0  # sleep_ms() only exists on the SQLite benchmark database
+
+    transport = httpx.ASGITransport(app=build_app(latency_ms))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up both pools
+        await client.get("/sync")
+        await client.get("/async")
+
+        print(f"{args.requests} requests, concurrency {args.concurrency}, query latency {latency_ms} ms")
+        for label, path in (("before (sync Session)", "/sync"), ("after (AsyncSession)", "/async")):
+            result = await run_load(client, path, args.requests, args.concurrency)
+            print(
+                f"  {label:<22} {result['rps']:8.1f} req/s   "
+                f"p50 {result['p50_ms']:7.1f} ms   p99 {result['p99_ms']:7.1f} ms"
+            )
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,122 @@
+"""
+Request latency with and without the authentication caches.
+
+Times authenticated task reads with AUTH_CACHE_ENABLED off (JWT decoded and
+user loaded from the database on every request), on (decoded tokens and
+user principals served from memory) and with AUTH_STATELESS_PRINCIPAL (the
+principal built from token claims, never touching the users table). With
+warm caches `GET /tasks/{id}` then only runs its own task lookup.
+
+`--latency-ms` adds a simulated network round trip to every SQL statement
+so the saved user lookup shows up as it would against a remote database.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_auth_cache --requests 500 --latency-ms 2
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+_DB_PATH = os.path.join(tempfile.gettempdir(), "bench_auth_cache.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+os.environ.setdefault("DATABASE_ECHO", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+
+from app.auth import create_user_token, hash_password, principal_cache, token_cache  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import async_engine, create_db_and_tables, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Task, User  # noqa: E402
+
+
+def seed() -> tuple:
+    """Create the benchmark user with a few tasks; return (user, task_id)."""
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == "bench@example.com")).first()
+        if user is None:
+            user = User(username="bench", email="bench@example.com",
+                        hashed_password=hash_password("benchmark"))
+            session.add(user)
+            session.commit()
+            session.refresh(user)
+        task = session.exec(select(Task).where(Task.user_id == user.id)).first()
+        if task is None:
+            for i in range(50):
+                session.add(Task(user_id=user.id, title=f"Task {i}"))
+            session.commit()
+            task = session.exec(select(Task).where(Task.user_id == user.id)).first()
+        return user, task.id
+
+
+async def run(client: httpx.AsyncClient, path: str, headers: dict, requests: int) -> dict:
+    """Issue sequential GETs and collect latency percentiles."""
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+    latencies.sort()
+    return {
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "rps": len(latencies) / sum(latencies),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    create_db_and_tables()
+    user, task_id = seed()
+    user_id = user.id
+
+    if args.latency_ms:
+        def simulate_round_trip(*_):
+            time.sleep(args.latency_ms / 1000)
+        event.listen(async_engine.sync_engine, "before_cursor_execute", simulate_round_trip)
+
+    headers = {"Authorization": f"Bearer {create_user_token(user)}"}
+    paths = {
+        "GET /tasks/{id}": f"/api/{user_id}/tasks/{task_id}",
+        "GET /tasks?limit=20": f"/api/{user_id}/tasks?limit=20",
+        "GET /tasks?all=true": f"/api/{user_id}/tasks?all=true",
+    }
+
+    modes = [
+        ("auth cache off", False, False),
+        ("auth cache on", True, False),
+        ("stateless", True, True),
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{args.requests} sequential requests, simulated DB latency {args.latency_ms} ms")
+        for label, path in paths.items():
+            print(f"  {label}")
+            for name, enabled, stateless in modes:
+                settings.AUTH_CACHE_ENABLED = enabled
+                settings.AUTH_STATELESS_PRINCIPAL = stateless
+                await client.get(path, headers=headers)  # warm caches
+                result = await run(client, path, headers, args.requests)
+                print(
+                    f"    {name:<16} p50 {result['p50_ms']:7.2f} ms   "
+                    f"p99 {result['p99_ms']:7.2f} ms   {result['rps']:8.1f} req/s"
+                )
+
+    print(f"  token cache hit rate:     {token_cache.stats()['hit_rate']:.2%}")
+    print(f"  principal cache hit rate: {principal_cache.stats()['hit_rate']:.2%}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
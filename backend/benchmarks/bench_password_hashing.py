@@ -0,0 +1,121 @@
+"""
+Event-loop responsiveness during a burst of logins.
+
+Fires `--logins` concurrent logins while probing `GET /health` every few
+milliseconds, once with bcrypt run inline on the event loop (the previous
+behaviour) and once on the password hashing pool. Reports login throughput,
+health-check latency while the burst is in flight, and how many logins were
+turned away with 429 by admission control.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_password_hashing --logins 40 --rounds 12
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+_DB_PATH = os.path.join(tempfile.gettempdir(), "bench_password_hashing.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+os.environ.setdefault("DATABASE_ECHO", "false")
+
+import httpx  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+
+from app.auth import hash_password, password_hasher, pwd_context  # noqa: E402
+from app.database import async_engine, create_db_and_tables, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import User  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark"
+
+
+def seed() -> None:
+    """Create the benchmark user with a hash at the configured work factor."""
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == EMAIL)).first()
+        if user is None:
+            user = User(username="bench", email=EMAIL, hashed_password="")
+        user.hashed_password = hash_password(PASSWORD)
+        session.add(user)
+        session.commit()
+
+
+async def run_inline(func, *args):
+    """The previous behaviour: bcrypt blocks the event loop."""
+    return func(*args)
+
+
+async def burst(client: httpx.AsyncClient, logins: int) -> dict:
+    """Run concurrent logins while probing /health; return timings."""
+    done = asyncio.Event()
+    probes = []
+
+    async def probe():
+        # Latency of a health check plus how late the loop woke us up for it
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            await client.get("/health")
+            probes.append(time.perf_counter() - started - 0.005)
+
+    async def login():
+        return await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+
+    prober = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+
+    probes.sort()
+    codes = [r.status_code for r in responses]
+    return {
+        "elapsed": elapsed,
+        "ok": codes.count(200),
+        "rejected": codes.count(429),
+        "health_p50_ms": probes[len(probes) // 2] * 1000,
+        "health_p99_ms": probes[int(len(probes) * 0.99)] * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    pwd_context.update(bcrypt__rounds=args.rounds)
+    create_db_and_tables()
+    seed()
+
+    password_hasher.workers = args.workers
+    password_hasher.max_pending = args.max_pending
+    pooled = password_hasher.run
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"{args.logins} concurrent logins, bcrypt rounds {args.rounds}, "
+              f"{args.workers} workers, max pending {args.max_pending}")
+        for label, runner in (("inline", run_inline), ("pool", pooled)):
+            password_hasher.run = runner
+            result = await burst(client, args.logins)
+            print(
+                f"  {label:<7} {result['ok'] / result['elapsed']:7.1f} logins/s   "
+                f"429s {result['rejected']:4}   /health p50 {result['health_p50_ms']:8.2f} ms   "
+                f"p99 {result['health_p99_ms']:8.2f} ms"
+            )
+    password_hasher.run = pooled
+    password_hasher.shutdown()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=64)
+    asyncio.run(main(parser.parse_args()))
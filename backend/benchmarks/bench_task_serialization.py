@@ -0,0 +1,121 @@
+"""
+Task list serialization: ORM + response_model vs the orjson fast path.
+
+Seeds one user with N tasks and times `GET /api/{user_id}/tasks?all=true`
+with TASKS_FAST_JSON off (SQLModel instances validated into TaskResponse)
+and on (column tuples serialized with orjson). Both paths are measured with
+the task cache disabled (query + serialization) and with a warm cache
+(serialization only). The script also checks that both paths return
+byte-identical bodies.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_task_serialization --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_DB_PATH = os.path.join(tempfile.gettempdir(), "bench_task_serialization.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+os.environ.setdefault("DATABASE_ECHO", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, insert  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from app.auth import create_access_token, hash_password  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import async_engine, create_db_and_tables, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Task, TaskCollection, User  # noqa: E402
+from app.task_cache import task_cache  # noqa: E402
+
+
+def seed(size: int) -> int:
+    """Replace the benchmark user's tasks with `size` generated rows."""
+    with Session(engine) as session:
+        user = session.get(User, 1)
+        if user is None:
+            user = User(id=1, username="bench", email="bench@example.com",
+                        hashed_password=hash_password("benchmark"))
+            session.add(user)
+            session.commit()
+
+        session.exec(delete(Task).where(Task.user_id == user.id))
+        session.exec(delete(TaskCollection).where(TaskCollection.user_id == user.id))
+        start = datetime(2025, 1, 1)
+        rows = [
+            {
+                "user_id": user.id,
+                "title": f"Task {i} – ünïcode ✓",
+                "description": None if i % 3 else f"Description for task {i}",
+                "completed": i % 4 == 0,
+                "completed_at": start + timedelta(hours=i) if i % 4 == 0 else None,
+                "created_at": start + timedelta(seconds=i, microseconds=i % 1000),
+                "updated_at": start + timedelta(seconds=i),
+            }
+            for i in range(size)
+        ]
+        session.exec(insert(Task), params=rows)
+        session.commit()
+        return user.id
+
+
+async def measure(client: httpx.AsyncClient, path: str, headers: dict, repeat: int) -> tuple:
+    """Return (best seconds per request, response body)."""
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        best = min(best, elapsed)
+        body = response.content
+    return best, body
+
+
+async def main(args: argparse.Namespace) -> None:
+    create_db_and_tables()
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in args.sizes:
+            user_id = seed(size)
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+            path = f"/api/{user_id}/tasks?all=true"
+            repeat = max(1, args.repeat if size < 100000 else args.repeat // 2)
+            print(f"{size} tasks (best of {repeat})")
+
+            bodies = {}
+            for cached in (False, True):
+                task_cache.enabled = cached
+                for fast in (False, True):
+                    settings.TASKS_FAST_JSON = fast
+                    await task_cache.backend.clear()
+                    if cached:
+                        await client.get(path, headers=headers)  # warm the cache
+                    seconds, body = await measure(client, path, headers, repeat)
+                    bodies[(cached, fast)] = body
+                    label = f"{'cache' if cached else 'no cache'}, {'orjson' if fast else 'response_model'}"
+                    print(f"  {label:<28} {size / seconds:12,.0f} rows/s   {seconds * 1000:9.1f} ms")
+
+            identical = len(set(bodies.values())) == 1
+            print(f"  bodies byte-identical: {identical}")
+            if not identical:
+                raise SystemExit("fast path output differs from the response_model output")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
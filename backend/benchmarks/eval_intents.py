@@ -0,0 +1,74 @@
+"""
+Accuracy of the chat intent parser against a labelled corpus.
+
+Each line of `intent_corpus.jsonl` is a chat message with the intent and
+arguments the fast path should produce, or `"intent": null` when the
+message has to go to the model. Reports how many commands were recognized
+(recall), how many recognized messages were parsed correctly (precision)
+and the parse time, and lists every mismatch.
+
+A message recognized as the wrong command, or recognized when it should
+have gone to the model, makes the script exit non-zero, as does accuracy
+below `--min-accuracy`.
+
+Usage (from the backend directory):
+    python -m benchmarks.eval_intents --min-accuracy 0.95
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+
+from app.intents import parse_intent  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "intent_corpus.jsonl")
+
+
+def main(args: argparse.Namespace) -> int:
+    with open(args.corpus, encoding="utf-8") as corpus:
+        cases = [json.loads(line) for line in corpus if line.strip()]
+
+    correct = recognized = commands = recalled = 0
+    mismatches = []
+    started = time.perf_counter()
+    for case in cases:
+        intent = parse_intent(case["text"])
+        got = (intent.name, intent.arguments) if intent else (None, None)
+        expected = (case["intent"], case["arguments"])
+        if case["intent"] is not None:
+            commands += 1
+            recalled += intent is not None
+        if intent is not None:
+            recognized += 1
+        if got == expected:
+            correct += 1
+        else:
+            mismatches.append((case["text"], expected, got))
+    elapsed = time.perf_counter() - started
+
+    # Falling through to the model is safe; running the wrong command is not
+    unsafe = [m for m in mismatches if m[2][0] is not None]
+    accuracy = correct / len(cases)
+    precision = (recognized - len(unsafe)) / recognized if recognized else 1.0
+    print(f"{len(cases)} messages ({commands} commands), {elapsed / len(cases) * 1e6:.1f} µs per message")
+    print(f"  accuracy  {accuracy:.2%}")
+    print(f"  recall    {recalled / commands if commands else 0:.2%}  (commands handled without the model)")
+    print(f"  precision {precision:.2%}  (recognized messages parsed correctly)")
+    for text, expected, got in mismatches:
+        label = "UNSAFE" if got[0] is not None else "missed"
+        print(f"  {label:<7} {text!r}: expected {expected}, got {got}")
+
+    return 1 if unsafe or accuracy < args.min_accuracy else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--min-accuracy", type=float, default=0.95)
+    sys.exit(main(parser.parse_args()))
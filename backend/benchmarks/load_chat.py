@@ -0,0 +1,204 @@
+"""
+Concurrent load test of the chat, auth and task endpoints.
+
+Starts the mock LLM server (`benchmarks/mock_llm.py`) in a subprocess,
+points the app at it through OPENROUTER_BASE_URL and runs the app in
+process against a fresh SQLite database. `--concurrency` virtual users then
+issue a weighted mix of requests for `--duration` seconds:
+
+- chat: `POST /api/{user_id}/chat` with prompts that exercise the intent
+  fast path, template replies, the reply cache and full two-call turns
+- tasks: list, create and toggle through the task API
+- login: `POST /api/auth/login` (bcrypt on the hashing pool)
+
+Reports throughput, p50/p95/p99 latency and the average time spent in the
+database, the LLM and chat tools per request, taken from the Server-Timing
+header (SERVER_TIMING_ENABLED is switched on for the run). Keep the mock
+latency fixed between runs so changes in our own overhead stand out.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_chat --concurrency 20 --duration 20 --latency-ms 300
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+PROMPTS = [
+    "add task buy milk",  # intent fast path
+    "show my pending tasks",  # intent fast path
+    "what's on my list?",  # list_tasks via the model, then the reply cache
+    "how many tasks do I have?",  # get_task_stats, template reply
+    "please add a task to call the dentist tomorrow",  # add_task via the model, template reply
+    "find tasks about milk",  # search_tasks via the model
+    "create a task to water the plants and then show my tasks",  # add_task then list_tasks in one response
+    "search for milk and list what's pending",  # search_tasks and list_tasks, run concurrently
+    "hello, what can you do?",  # no tools
+]
+OPERATIONS = {"chat": 0.5, "list_tasks": 0.25, "create_task": 0.1, "toggle_task": 0.05, "login": 0.1}
+PASSWORD = "benchmark"
+
+
+def configure(args: argparse.Namespace) -> None:
+    """Environment for the app; must run before `app` is imported."""
+    db_path = os.path.join(tempfile.gettempdir(), "load_chat.sqlite3")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["OPENROUTER_API_KEY"] = "mock"
+    os.environ["OPENROUTER_BASE_URL"] = args.llm_url
+    os.environ["SERVER_TIMING_ENABLED"] = "true"
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+    os.environ.setdefault("CORS_ORIGINS", "http://localhost:3000")
+    os.environ.setdefault("DATABASE_ECHO", "false")
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """`db;dur=1.5, llm;dur=300.2` -> {"db": 1.5, "llm": 300.2} (milliseconds)."""
+    timings = {}
+    for part in filter(None, (p.strip() for p in header.split(","))):
+        name, _, duration = part.partition(";dur=")
+        if duration:
+            timings[name] = float(duration)
+    return timings
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+async def start_mock(args: argparse.Namespace) -> subprocess.Popen:
+    """Run the mock LLM server and wait until it answers."""
+    import httpx
+
+    process = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.mock_llm", "--port", str(args.llm_port),
+        "--latency-ms", str(args.latency_ms), "--token-ms", str(args.token_ms),
+    ])
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                await client.get(f"http://127.0.0.1:{args.llm_port}/health")
+                return process
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("mock LLM server did not start")
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+
+    from app.main import app
+
+    results: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as client:
+
+            async def call(operation: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+                started = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                results[operation].append({
+                    "latency": (time.perf_counter() - started) * 1000,
+                    "ok": response.status_code < 400,
+                    "timings": parse_server_timing(response.headers.get("server-timing", "")),
+                })
+                return response
+
+            async def virtual_user(number: int, deadline: float) -> None:
+                rng = random.Random(args.seed + number)
+                email = f"load{number}@example.com"
+                signup = await client.post("/api/auth/signup", json={
+                    "username": f"load{number}", "email": email, "password": PASSWORD
+                })
+                signup.raise_for_status()
+                body = signup.json()
+                user_id = body["user_id"]
+                headers = {"Authorization": f"Bearer {body['access_token']}"}
+                task_ids: List[int] = []
+                conversation: Dict[str, Any] = {}  # Replies are only cached per conversation
+                operations, weights = zip(*OPERATIONS.items())
+
+                while time.perf_counter() < deadline:
+                    operation = rng.choices(operations, weights)[0]
+                    if operation == "chat":
+                        response = await call("chat", "POST", f"/api/{user_id}/chat", headers=headers,
+                                              json={"message": rng.choice(PROMPTS), **conversation})
+                        if response.status_code < 400:
+                            conversation["conversation_id"] = response.json()["conversation_id"]
+                    elif operation == "list_tasks":
+                        await call("list_tasks", "GET", f"/api/{user_id}/tasks?limit=20", headers=headers)
+                    elif operation == "create_task":
+                        response = await call("create_task", "POST", f"/api/{user_id}/tasks", headers=headers,
+                                              json={"title": f"Load task {rng.randrange(10000)}"})
+                        if response.status_code < 400:
+                            task_ids.append(response.json()["id"])
+                    elif operation == "toggle_task" and task_ids:
+                        await call("toggle_task", "PATCH",
+                                   f"/api/{user_id}/tasks/{rng.choice(task_ids)}/complete", headers=headers)
+                    elif operation == "login":
+                        await call("login", "POST", "/api/auth/login",
+                                   json={"email": email, "password": PASSWORD})
+
+            deadline = time.perf_counter() + args.duration
+            started = time.perf_counter()
+            await asyncio.gather(*(virtual_user(n, deadline) for n in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+
+    print(f"{args.concurrency} virtual users for {elapsed:.1f} s, mock LLM latency "
+          f"{args.latency_ms} ms + {args.token_ms} ms/word, bcrypt rounds {args.bcrypt_rounds}")
+    print(f"  {'endpoint':<12} {'requests':>8} {'errors':>6} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'db ms':>7} {'llm ms':>8} {'tool ms':>7}")
+    rows = sorted(results.items())
+    rows.append(("all", [sample for _, samples in rows for sample in samples]))
+    for operation, samples in rows:
+        latencies = sorted(s["latency"] for s in samples)
+
+        def average(name: str) -> float:
+            return sum(s["timings"].get(name, 0.0) for s in samples) / len(samples)
+
+        print(
+            f"  {operation:<12} {len(samples):>8} {sum(not s['ok'] for s in samples):>6} "
+            f"{len(samples) / elapsed:>7.1f} {percentile(latencies, 0.50):>8.1f} "
+            f"{percentile(latencies, 0.95):>8.1f} {percentile(latencies, 0.99):>8.1f} "
+            f"{average('db'):>7.1f} {average('llm'):>8.1f} {average('tool'):>7.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument("--llm-port", type=int, default=8765)
+    parser.add_argument("--llm-url", help="Use an already running mock (e.g. http://127.0.0.1:8765/v1)")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    mock = None
+    if args.llm_url is None:
+        args.llm_url = f"http://127.0.0.1:{args.llm_port}/v1"
+        mock = asyncio.run(start_mock(args))
+    configure(args)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if mock is not None:
+            mock.terminate()
+            mock.wait()
+
+
+if __name__ == "__main__":
+    main()
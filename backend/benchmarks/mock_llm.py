@@ -0,0 +1,225 @@
+"""
+OpenAI-compatible stand-in for the chat provider, for load tests.
+
+Serves `POST /v1/chat/completions` (plain and `stream: true`) with
+configurable latency, so the chat endpoints can be benchmarked without
+OpenRouter. Point the backend at it with:
+
+    OPENROUTER_API_KEY=mock OPENROUTER_BASE_URL=http://127.0.0.1:8765/v1
+
+Replies are scripted: when the request offers tools and the conversation
+ends with a user message, the first rule whose regular expression matches
+that message decides the tool call. `{1}`, `{2}`... in the rule's arguments
+are replaced by the regex groups, and a rule with `"tool": null` answers in
+plain text. A rule with a `"tools"` list of `{"tool", "arguments"}` entries
+returns several tool calls in one response, as models do for "add X and
+show my tasks", which exercises the concurrent and write-then-read tool
+paths. Once tool results come back, the reply is plain text that quotes
+them. `--script` loads rules from a JSON file shaped like DEFAULT_SCRIPT.
+
+Latency: `--latency-ms` before the response (time to first token when
+streaming), then `--token-ms` per streamed word, each with `--jitter`
+relative random variation. `GET /stats` counts the requests served.
+
+Usage (from the backend directory):
+    python -m benchmarks.mock_llm --port 8765 --latency-ms 400 --token-ms 15
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_SCRIPT: List[Dict[str, Any]] = [
+    {"match": r"(?:add|create) (?:a )?(?:task )?(?:to )?(.+?),? (?:and|then|and then) (?:show|list)", "tools": [
+        {"tool": "add_task", "arguments": {"title": "{1}"}},
+        {"tool": "list_tasks", "arguments": {}},
+    ]},
+    {"match": r"(?:find|search)(?: for)?(?: tasks?)?(?: about| with)? (.+?),? (?:and|then|and then) (?:show|list)",
+     "tools": [
+        {"tool": "search_tasks", "arguments": {"query": "{1}"}},
+        {"tool": "list_tasks", "arguments": {"completed": False}},
+    ]},
+    {"match": r"how many", "tool": "get_task_stats", "arguments": {}},
+    {"match": r"(?:find|search)(?: for)?(?: tasks?)?(?: about| with)? (.+)", "tool": "search_tasks",
+     "arguments": {"query": "{1}"}},
+    {"match": r"(?:add|create|remind me to) (?:a )?(?:task )?(?:to )?(.+)", "tool": "add_task",
+     "arguments": {"title": "{1}"}},
+    {"match": r"(?:done|finish|finished|complete) .*?(\d+)", "tool": "complete_task",
+     "arguments": {"task_id": "{1}"}},
+    {"match": r"(?:delete|remove) .*?(\d+)", "tool": "delete_task", "arguments": {"task_id": "{1}"}},
+    {"match": r"(?:show|list|what)", "tool": "list_tasks", "arguments": {}},
+    {"match": r".*", "tool": None, "arguments": {}},
+]
+
+app = FastAPI(title="Mock LLM")
+config = argparse.Namespace(latency_ms=300.0, token_ms=10.0, jitter=0.2, reply_words=30, script=DEFAULT_SCRIPT)
+served = {"requests": 0, "streamed": 0, "tool_calls": 0}
+
+
+def delay(ms: float) -> float:
+    return max(0.0, ms * (1 + random.uniform(-config.jitter, config.jitter))) / 1000
+
+
+def fill(value: Any, groups: tuple) -> Any:
+    """Substitute `{n}` placeholders; a value that is only a number becomes an int."""
+    if not isinstance(value, str):
+        return value
+    text = re.sub(r"\{(\d+)\}", lambda m: (groups[int(m.group(1)) - 1] or "").strip(), value)
+    return int(text) if text.isdigit() else text
+
+
+def scripted_tool_calls(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The tool calls the script prescribes for the last user message, in order."""
+    text = (messages[-1].get("content") or "").strip().rstrip("?!.")
+    for rule in config.script:
+        match = re.search(rule["match"], text, re.IGNORECASE)
+        if match is None:
+            continue
+        calls = rule.get("tools") or ([rule] if rule.get("tool") else [])
+        return [{
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {
+                "name": call["tool"],
+                "arguments": json.dumps({key: fill(value, match.groups()) for key, value in call["arguments"].items()}),
+            },
+        } for call in calls]
+    return []
+
+
+def reply_text(messages: List[Dict[str, Any]]) -> str:
+    """Plain answer of about `reply_words` words, quoting tool results if there are any."""
+    results = [m.get("content") or "" for m in messages if m.get("role") == "tool"]
+    words = ["Sure!", "Here", "is", "what", "I", "found:"] if results else ["Happy", "to", "help."]
+    words += " ".join(results).replace("\n", " ").split()[: config.reply_words]
+    filler = "I can add, list, search, complete, update or delete tasks for you.".split()
+    while len(words) < config.reply_words:
+        words += filler
+    return " ".join(words[: max(config.reply_words, 3)])
+
+
+def usage(messages: List[Dict[str, Any]], completion: str) -> Dict[str, int]:
+    prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+    completion_tokens = len(completion) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def chunk(completion_id: str, model: str, delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+    body = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(body)}\n\n"
+
+
+async def stream_reply(
+    completion_id: str,
+    model: str,
+    content: Optional[str],
+    tool_calls: List[Dict[str, Any]]
+) -> AsyncIterator[str]:
+    await asyncio.sleep(delay(config.latency_ms))
+    yield chunk(completion_id, model, {"role": "assistant", "content": ""})
+    if tool_calls:
+        # One index per call, each with its arguments split over two chunks, as real providers do
+        for index, tool_call in enumerate(tool_calls):
+            arguments = tool_call["function"]["arguments"]
+            half = len(arguments) // 2
+            yield chunk(completion_id, model, {"tool_calls": [{
+                "index": index, "id": tool_call["id"], "type": "function",
+                "function": {"name": tool_call["function"]["name"], "arguments": arguments[:half]},
+            }]})
+            yield chunk(completion_id, model, {"tool_calls": [
+                {"index": index, "function": {"arguments": arguments[half:]}}
+            ]})
+        yield chunk(completion_id, model, {}, "tool_calls")
+    else:
+        for number, word in enumerate(content.split(" ")):
+            await asyncio.sleep(delay(config.token_ms))
+            yield chunk(completion_id, model, {"content": word if number == 0 else f" {word}"})
+        yield chunk(completion_id, model, {}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    model = body.get("model", "mock")
+    served["requests"] += 1
+
+    tool_calls = []
+    if body.get("tools") and messages and messages[-1].get("role") == "user":
+        tool_calls = scripted_tool_calls(messages)
+    content = None if tool_calls else reply_text(messages)
+    served["tool_calls"] += len(tool_calls)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:16]}"
+
+    if body.get("stream"):
+        served["streamed"] += 1
+        return StreamingResponse(
+            stream_reply(completion_id, model, content, tool_calls), media_type="text/event-stream"
+        )
+
+    # Without streaming the whole answer arrives at once, after generation
+    words = len(content.split()) if content else 8
+    await asyncio.sleep(delay(config.latency_ms) + words * delay(config.token_ms))
+    message: Dict[str, Any] = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return JSONResponse({
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool_calls else "stop"}],
+        "usage": usage(messages, content or "".join(call["function"]["arguments"] for call in tool_calls)),
+    })
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
+
+
+@app.get("/stats")
+async def stats():
+    return served
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--reply-words", type=int, default=30)
+    parser.add_argument("--script", help="JSON file with tool call rules, single or multi-call (see DEFAULT_SCRIPT)")
+    args = parser.parse_args()
+
+    config.latency_ms = args.latency_ms
+    config.token_ms = args.token_ms
+    config.jitter = args.jitter
+    config.reply_words = args.reply_words
+    if args.script:
+        with open(args.script, encoding="utf-8") as script:
+            config.script = json.load(script)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
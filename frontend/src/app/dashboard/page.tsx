@@ -1,9 +1,10 @@
 'use client';
 
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useRouter } from 'next/navigation';
 import { useAuth } from '@/lib/auth';
-import { tasksAPI, Task } from '@/lib/api';
+import axios from 'axios';
+import { tasksAPI, Task, TaskChanges } from '@/lib/api';
 import Sidebar from '@/components/layout/Sidebar';
 import TaskInput from '@/components/dashboard/TaskInput';
 import TaskItem from '@/components/dashboard/TaskItem';
@@ -38,6 +39,12 @@ export default function DashboardPage() {
     }
   }, [isAuthenticated, authLoading, router]);
 
+  // Delta sync state: the /tasks/changes token and the collection version it covers.
+  // Syncs run one at a time so each one starts from the previous token.
+  const syncToken = useRef<string | null>(null);
+  const syncedVersion = useRef(0);
+  const syncQueue = useRef<Promise<void>>(Promise.resolve());
+
   // Fetch tasks
   useEffect(() => {
     if (user) {
@@ -45,17 +52,53 @@ export default function DashboardPage() {
     }
   }, [user]);
 
-  const fetchTasks = async () => {
+  // Live updates from other clients (e.g. tasks the chatbot created): fetch only
+  // what changed, skipping events an earlier sync already covered
+  useEffect(() => {
     if (!user) return;
-    try {
-      setLoading(true);
-      const data = await tasksAPI.getAll(user.id);
-      setTasks(data);
-    } catch (error) {
-      console.error('Failed to fetch tasks:', error);
-    } finally {
-      setLoading(false);
+    return tasksAPI.subscribe(user.id, (change) => {
+      syncTasks(change ? change.version : undefined);
+    });
+  }, [user]);
+
+  const applyChanges = (current: Task[], changes: TaskChanges): Task[] => {
+    const deleted = new Set(changes.deleted);
+    const merged = new Map(
+      (changes.reset ? [] : current)
+        .filter(task => !deleted.has(task.id))
+        .map(task => [task.id, task] as [number, Task])
+    );
+    for (const task of changes.changed) {
+      const known = merged.get(task.id);
+      if (!known || known.version <= task.version) merged.set(task.id, task);
     }
+    return Array.from(merged.values());
+  };
+
+  // Apply the changes since the last sync (everything with `full`); with `version`,
+  // only if it is newer than what we have
+  const syncTasks = (version?: number, full = false): Promise<void> => {
+    if (!user) return Promise.resolve();
+    const userId = user.id;
+    syncQueue.current = syncQueue.current.then(async () => {
+      if (!full && version !== undefined && version <= syncedVersion.current) return;
+      try {
+        const changes = await tasksAPI.getChanges(userId, full ? null : syncToken.current);
+        setTasks(current => applyChanges(current, changes));
+        syncToken.current = changes.next_token;
+        syncedVersion.current = changes.version;
+      } catch (error) {
+        console.error('Failed to sync tasks:', error);
+      }
+    });
+    return syncQueue.current;
+  };
+
+  const fetchTasks = async () => {
+    if (!user) return;
+    setLoading(true);
+    await syncTasks(undefined, true);
+    setLoading(false);
   };
 
   const handleAddTask = async (title: string, description: string) => {
@@ -69,12 +112,19 @@ export default function DashboardPage() {
     }
   };
 
+  // The task changed elsewhere (e.g. through the chatbot): sync instead of overwriting it
+  const isVersionConflict = (error: unknown) =>
+    axios.isAxiosError(error) && error.response?.status === 412;
+
+  const versionOf = (taskId: number) => tasks.find(task => task.id === taskId)?.version;
+
   const handleToggleComplete = async (taskId: number) => {
     if (!user) return;
     try {
-      const updatedTask = await tasksAPI.toggleComplete(user.id, taskId);
+      const updatedTask = await tasksAPI.toggleComplete(user.id, taskId, versionOf(taskId));
       setTasks(tasks.map(task => task.id === taskId ? updatedTask : task));
     } catch (error) {
+      if (isVersionConflict(error)) return syncTasks();
       console.error('Failed to toggle task:', error);
     }
   };
@@ -82,9 +132,10 @@ export default function DashboardPage() {
   const handleEditTaskSave = async (taskId: number, title: string, description: string) => {
     if (!user) return;
     try {
-      const updatedTask = await tasksAPI.update(user.id, taskId, { title, description });
+      const updatedTask = await tasksAPI.update(user.id, taskId, { title, description }, versionOf(taskId));
       setTasks(tasks.map(task => task.id === taskId ? updatedTask : task));
     } catch (error) {
+      if (isVersionConflict(error)) syncTasks();
       console.error('Failed to update task:', error);
       throw error;
     }
@@ -93,9 +144,10 @@ export default function DashboardPage() {
   const handleDeleteTask = async (taskId: number) => {
     if (!user) return;
     try {
-      await tasksAPI.delete(user.id, taskId);
+      await tasksAPI.delete(user.id, taskId, versionOf(taskId));
       setTasks(tasks.filter(task => task.id !== taskId));
     } catch (error) {
+      if (isVersionConflict(error)) return syncTasks();
       console.error('Failed to delete task:', error);
     }
   };
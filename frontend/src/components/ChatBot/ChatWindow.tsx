@@ -13,7 +13,7 @@ import MessageBubble from './MessageBubble';
 import Composer from './Composer';
 import QuickActions from './QuickActions';
 import BotAvatar from './BotAvatar';
-import { sendMessage, ChatMessage } from '@/lib/chatApi';
+import { streamMessage, ChatMessage } from '@/lib/chatApi';
 
 interface ChatWindowProps {
   userId: number;
@@ -51,34 +51,40 @@ export default function ChatWindow({ userId, isOpen, onClose }: ChatWindowProps)
     setIsLoading(true);
     setError(null);
 
+    // Placeholder bubble that fills in as tokens arrive
+    const assistantMessage: ChatMessage = {
+      role: 'assistant',
+      content: '',
+      created_at: new Date().toISOString()
+    };
+    setMessages((prev) => [...prev, assistantMessage]);
+
+    const updateAssistant = (text: string) => {
+      setMessages((prev) => [...prev.slice(0, -1), { ...prev[prev.length - 1], content: text }]);
+    };
+
     try {
-      const response = await sendMessage(userId, content, conversationId);
-      
-      // Update conversation ID if this is the first message
-      if (!conversationId) {
-        setConversationId(response.conversation_id);
-      }
+      let streamed = '';
+      const response = await streamMessage(userId, content, conversationId, {
+        // Update conversation ID if this is the first message
+        onConversation: (id) => setConversationId(id),
+        onToken: (token) => {
+          streamed += token;
+          updateAssistant(streamed);
+        },
+        // The final answer is generated after the tools run
+        onToolStart: () => {
+          streamed = '';
+        },
+      });
 
-      // Add assistant response
-      const assistantMessage: ChatMessage = {
-        role: 'assistant',
-        content: response.response,
-        created_at: new Date().toISOString()
-      };
-      
-      setMessages((prev) => [...prev, assistantMessage]);
+      updateAssistant(response.response);
     } catch (err: any) {
-      const errorMsg = err.response?.data?.detail || 'Failed to send message. Please try again.';
+      const errorMsg = err.message || 'Failed to send message. Please try again.';
       setError(errorMsg);
       
-      // Add error message
-      const errorMessage: ChatMessage = {
-        role: 'assistant',
-        content: errorMsg,
-        created_at: new Date().toISOString()
-      };
-      
-      setMessages((prev) => [...prev, errorMessage]);
+      // Show the error in place of the unfinished reply
+      updateAssistant(errorMsg);
     } finally {
       setIsLoading(false);
     }
@@ -86,6 +86,35 @@ export interface Task {
     completed: boolean;
     created_at: string;
     updated_at: string;
+    version: number;
+}
+
+export interface TaskPage {
+    items: Task[];
+    next_cursor: string | null;
+}
+
+// Delta sync from /tasks/changes: drop `deleted`, then upsert `changed` by id
+export interface TaskChanges {
+    changed: Task[];
+    deleted: number[];
+    next_token: string;
+    version: number;
+    reset: boolean;
+}
+
+// Pushed by /tasks/events after every task write (dashboard, chatbot, import, ...)
+export interface TaskChangeEvent {
+    type: 'tasks';
+    version: number;
+    changed: number[];
+    deleted: number[];
+}
+
+// Short-lived credential for opening /tasks/events from EventSource
+export interface StreamToken {
+    token: string;
+    expires_in: number;
 }
 
 export interface TaskCreate {
@@ -99,9 +128,29 @@ export interface TaskUpdate {
     completed?: boolean;
 }
 
+const ifMatch = (version?: number) =>
+    version === undefined ? undefined : { 'If-Match': `"${version}"` };
+
 export const tasksAPI = {
     getAll: async (userId: number): Promise<Task[]> => {
-        const response = await api.get<Task[]>(`/api/${userId}/tasks`);
+        const response = await api.get<Task[]>(`/api/${userId}/tasks`, {
+            params: { all: true },
+        });
+        return response.data;
+    },
+
+    getPage: async (userId: number, cursor?: string | null, limit?: number): Promise<TaskPage> => {
+        const response = await api.get<TaskPage>(`/api/${userId}/tasks`, {
+            params: { cursor: cursor || undefined, limit },
+        });
+        return response.data;
+    },
+
+    // Tasks changed since `since` (the previous `next_token`); without it, the full list
+    getChanges: async (userId: number, since?: string | null): Promise<TaskChanges> => {
+        const response = await api.get<TaskChanges>(`/api/${userId}/tasks/changes`, {
+            params: { since: since || undefined },
+        });
         return response.data;
     },
 
@@ -115,19 +164,60 @@ export const tasksAPI = {
         return response.data;
     },
 
-    update: async (userId: number, taskId: number, data: TaskUpdate): Promise<Task> => {
-        const response = await api.put<Task>(`/api/${userId}/tasks/${taskId}`, data);
+    // Pass the task's last known version to reject the write (HTTP 412)
+    // if someone else changed the task in the meantime.
+    update: async (userId: number, taskId: number, data: TaskUpdate, version?: number): Promise<Task> => {
+        const response = await api.put<Task>(`/api/${userId}/tasks/${taskId}`, data, {
+            headers: ifMatch(version),
+        });
         return response.data;
     },
 
-    delete: async (userId: number, taskId: number): Promise<void> => {
-        await api.delete(`/api/${userId}/tasks/${taskId}`);
+    delete: async (userId: number, taskId: number, version?: number): Promise<void> => {
+        await api.delete(`/api/${userId}/tasks/${taskId}`, { headers: ifMatch(version) });
     },
 
-    toggleComplete: async (userId: number, taskId: number): Promise<Task> => {
-        const response = await api.patch<Task>(`/api/${userId}/tasks/${taskId}/complete`);
+    toggleComplete: async (userId: number, taskId: number, version?: number): Promise<Task> => {
+        const response = await api.patch<Task>(`/api/${userId}/tasks/${taskId}/complete`, undefined, {
+            headers: ifMatch(version),
+        });
         return response.data;
     },
+
+    // Live change notifications. `onChange(null)` means events were missed and
+    // the list should be reloaded. Returns a function that closes the stream.
+    subscribe: (userId: number, onChange: (change: TaskChangeEvent | null) => void): (() => void) => {
+        let source: EventSource | null = null;
+        let closed = false;
+        let retry: ReturnType<typeof setTimeout> | undefined;
+        // EventSource cannot send headers, so it gets a short-lived stream token in
+        // the query string rather than the access token. The stream token expires
+        // quickly, so instead of letting EventSource retry with it, reconnect with
+        // a fresh one and resync whatever was missed in between.
+        const connect = async (reconnect: boolean) => {
+            try {
+                const response = await api.post<StreamToken>(`/api/${userId}/tasks/events/token`);
+                if (closed) return;
+                const token = encodeURIComponent(response.data.token);
+                source = new EventSource(`${API_URL}/api/${userId}/tasks/events?token=${token}`);
+                source.addEventListener('tasks', (event) => onChange(JSON.parse((event as MessageEvent).data)));
+                source.addEventListener('resync', () => onChange(null));
+                source.onerror = () => {
+                    source?.close();
+                    if (!closed) retry = setTimeout(() => connect(true), 5000);
+                };
+                if (reconnect) onChange(null);
+            } catch {
+                if (!closed) retry = setTimeout(() => connect(reconnect), 5000);
+            }
+        };
+        connect(false);
+        return () => {
+            closed = true;
+            clearTimeout(retry);
+            source?.close();
+        };
+    },
 };
 
 export default api;
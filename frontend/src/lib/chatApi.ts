@@ -18,6 +18,7 @@ export interface ToolCall {
     tool_name: string;
     inputs: Record<string, any>;
     output: Record<string, any>;
+    duration_ms?: number;
 }
 
 export interface ChatRequest {
@@ -70,6 +71,92 @@ export async function sendMessage(
     return response.data;
 }
 
+export interface ChatStreamHandlers {
+    onConversation?: (conversationId: number) => void;
+    onToken?: (content: string) => void;
+    onToolStart?: (toolName: string) => void;
+    onToolEnd?: (toolCall: ToolCall) => void;
+}
+
+/**
+ * Send a chat message and receive the reply as Server-Sent Events.
+ *
+ * EventSource only supports GET, so the stream is read with fetch.
+ * Resolves with the complete response once the `done` event arrives.
+ */
+export async function streamMessage(
+    userId: number,
+    message: string,
+    conversationId: number | undefined,
+    handlers: ChatStreamHandlers
+): Promise<ChatResponse> {
+    const token = getAuthToken();
+
+    if (!token) {
+        throw new Error('Not authenticated');
+    }
+
+    const response = await fetch(`${API_URL}/api/${userId}/chat/stream`, {
+        method: 'POST',
+        headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ message, conversation_id: conversationId } as ChatRequest)
+    });
+
+    if (!response.ok || !response.body) {
+        const body = await response.json().catch(() => ({}));
+        throw new Error(body.detail || 'Failed to send message. Please try again.');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of block.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (!data) continue;
+            const payload = JSON.parse(data);
+
+            switch (event) {
+                case 'conversation':
+                    handlers.onConversation?.(payload.conversation_id);
+                    break;
+                case 'token':
+                    handlers.onToken?.(payload.content);
+                    break;
+                case 'tool_start':
+                    handlers.onToolStart?.(payload.tool_name);
+                    break;
+                case 'tool_end':
+                    handlers.onToolEnd?.(payload);
+                    break;
+                case 'done':
+                    return payload as ChatResponse;
+                case 'error':
+                    throw new Error(payload.detail);
+            }
+        }
+    }
+
+    throw new Error('Connection closed before the response completed');
+}
+
 /**
  * Get conversation history (if needed in the future)
  */